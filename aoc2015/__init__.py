@@ -0,0 +1,20 @@
+"""
+Advent of Code 2015
+Tooling shared across the daily solutions.
+"""
+
+import sys
+from importlib import import_module
+from os import path
+from types import ModuleType
+
+REPO_ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+def import_day(day: int) -> ModuleType:
+    """Import the solution module for a day."""
+
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+
+    return import_module(f"day{day}.main")
@@ -0,0 +1,238 @@
+"""
+Advent of Code 2015
+Command line entry point, e.g. `python -m aoc2015 run --days 1-25 --jobs 4`.
+"""
+
+import asyncio
+import sys
+import time
+from argparse import ArgumentParser, Namespace
+from os import cpu_count
+
+from aoc2015.benchmarks import (
+    BASELINE_FILE,
+    DEFAULT_MAX_RATIO,
+    DEFAULT_REPEAT,
+    find_regressions,
+    find_unguarded_benchmarks,
+    read_baseline,
+    run_benchmarks,
+    write_baseline,
+)
+from aoc2015.instrumentation import ENVIRONMENT_VARIABLE, get_report_path, write_report
+from aoc2015.runner import (
+    RunOptions,
+    discover_days,
+    parse_day_ranges,
+    run_days,
+    write_results_csv,
+    write_results_json,
+)
+from aoc2015.server import DEFAULT_HOST, DEFAULT_MAX_PENDING, DEFAULT_PORT, query, serve
+
+
+def build_parser() -> ArgumentParser:
+    """Build the command line argument parser."""
+
+    parser = ArgumentParser(prog="aoc2015")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the daily solutions")
+    run_parser.add_argument("--days", default="1-25", help='days to run, e.g. "1-5,9"')
+    run_parser.add_argument("--jobs", type=int, default=cpu_count() or 1)
+    run_parser.add_argument("--format", choices=["json", "csv"], default="json")
+    run_parser.add_argument("--output", help="file to write results to (default: stdout)")
+    run_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="reuse parsed inputs cached by earlier runs",
+    )
+    run_parser.add_argument(
+        "--memoize",
+        action="store_true",
+        help="reuse the answers of slow solvers from earlier runs with the same code and input",
+    )
+    run_parser.add_argument(
+        "--instrument",
+        metavar="REPORT",
+        help=f"record hot-loop call statistics to this file (or set {ENVIRONMENT_VARIABLE})",
+    )
+    run_parser.add_argument(
+        "--memory-profile",
+        action="store_true",
+        help="report peak memory and top allocation sites for parsing and solving",
+    )
+    run_parser.add_argument(
+        "--memory-budget",
+        type=float,
+        metavar="MB",
+        help="stop a day early once it has allocated more than this many megabytes",
+    )
+    run_parser.add_argument(
+        "--budget",
+        type=float,
+        help="fail if the whole run takes longer than this many seconds",
+    )
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark the daily solutions")
+    bench_parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help='benchmark name prefixes to run, e.g. "day2" (default: all)',
+    )
+    bench_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    bench_parser.add_argument("--baseline", default=BASELINE_FILE)
+    bench_parser.add_argument(
+        "--max-ratio",
+        type=float,
+        default=DEFAULT_MAX_RATIO,
+        help="fail if a benchmark is this many times slower than its baseline",
+    )
+    bench_parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="store the timings of this run as the new baseline",
+    )
+
+    serve_parser = subparsers.add_parser("serve", help="serve solutions from warm workers")
+    serve_parser.add_argument("--jobs", type=int, default=cpu_count() or 1)
+    serve_parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=DEFAULT_MAX_PENDING,
+        help="how many solves may be queued for the workers at once",
+    )
+
+    query_parser = subparsers.add_parser("query", help="ask a running server for solutions")
+    query_parser.add_argument("--days", default="1-25", help='days to solve, e.g. "1-5,9"')
+
+    for subparser in (serve_parser, query_parser):
+        subparser.add_argument("--socket", help="Unix socket path (default: use TCP)")
+        subparser.add_argument("--host", default=DEFAULT_HOST)
+        subparser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    return parser
+
+
+def run(args: Namespace) -> int:
+    """Run the selected days and report their timings."""
+
+    available_days = set(discover_days())
+    days = [day for day in parse_day_ranges(args.days) if day in available_days]
+
+    start = time.perf_counter()
+    instrumentation_report_path = get_report_path(args.instrument)
+    options = RunOptions(
+        cache=args.cache,
+        memoize=args.memoize,
+        instrument=instrumentation_report_path is not None,
+        memory_profile=args.memory_profile,
+        memory_budget_bytes=(
+            int(args.memory_budget * 1024 * 1024) if args.memory_budget is not None else None
+        ),
+    )
+    results = run_days(days, args.jobs, options)
+    total_wall_time = time.perf_counter() - start
+
+    if instrumentation_report_path:
+        report = {f"day{result.day}": result.instrumentation for result in results}
+        write_report(report, instrumentation_report_path)
+
+    output = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            write_results_json(results, total_wall_time, output)
+        else:
+            write_results_csv(results, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    exit_code = 0
+
+    for result in results:
+        if result.status != "ok":
+            print(f"Day {result.day} failed: {result.error}", file=sys.stderr)
+            exit_code = 1
+
+    if args.budget is not None and total_wall_time > args.budget:
+        print(
+            f"Run took {total_wall_time:.2f}s, exceeding the budget of {args.budget:.2f}s.",
+            file=sys.stderr,
+        )
+        exit_code = 1
+
+    return exit_code
+
+
+def bench(args: Namespace) -> int:
+    """Run the benchmarks and compare them against the stored baseline."""
+
+    timings = run_benchmarks(args.benchmarks, args.repeat)
+    baseline = read_baseline(args.baseline)
+
+    for key, current in timings.items():
+        stored = baseline.get(key)
+        comparison = f" ({current / stored:.2f}x baseline)" if stored else ""
+        print(f"{key}: {current * 1000:.3f} ms{comparison}")
+
+    for name in find_unguarded_benchmarks(timings):
+        print(
+            f"{name} is below the noise floor at every scale and is not checked for regressions.",
+            file=sys.stderr,
+        )
+
+    if args.update_baseline:
+        write_baseline(timings, args.baseline)
+        print(f"Baseline written to {args.baseline}.")
+        return 0
+
+    regressions = find_regressions(timings, baseline, args.max_ratio)
+    for regression in regressions:
+        print(
+            f"{regression.key} regressed: {regression.baseline * 1000:.3f} ms -> "
+            f"{regression.current * 1000:.3f} ms ({regression.ratio:.2f}x)",
+            file=sys.stderr,
+        )
+
+    return 1 if regressions else 0
+
+
+def run_query(args: Namespace) -> int:
+    """Ask a running server to solve the selected days and print their output."""
+
+    responses = asyncio.run(query(parse_day_ranges(args.days), args.socket, args.host, args.port))
+
+    exit_code = 0
+
+    for response in responses:
+        if response["status"] != "ok":
+            print(f"Error: {response['error']}", file=sys.stderr)
+            exit_code = 1
+            continue
+
+        source = "cached" if response["cached"] else "solved"
+        print(f"Day {response['day']} ({source} in {response['elapsed'] * 1000:.1f} ms):")
+        print(response["output"])
+
+    return exit_code
+
+
+def main() -> None:
+    """Execute the program."""
+
+    args = build_parser().parse_args()
+
+    match args.command:
+        case "run":
+            sys.exit(run(args))
+        case "bench":
+            sys.exit(bench(args))
+        case "serve":
+            asyncio.run(serve(args.jobs, args.socket, args.host, args.port, args.max_pending))
+        case "query":
+            sys.exit(run_query(args))
+
+
+if __name__ == "__main__":
+    main()
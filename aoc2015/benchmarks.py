@@ -0,0 +1,367 @@
+"""
+Advent of Code 2015
+Benchmark the daily solutions on seeded synthetic inputs of several sizes.
+"""
+
+import json
+import random
+import string
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from os import makedirs, path
+from tempfile import TemporaryDirectory
+from typing import Any, Optional
+
+from aoc2015 import REPO_ROOT, import_day
+
+BASELINE_FILE = path.join(REPO_ROOT, ".benchmarks", "baseline.json")
+
+SEED = 2015
+DEFAULT_REPEAT = 3
+DEFAULT_MAX_RATIO = 1.5
+
+# NOTE: Timings below this many seconds are dominated by noise, so they are recorded
+# but never reported as regressions. Above it, a regression must also be slower by at
+# least `MIN_SLOWDOWN` seconds, since a few milliseconds of jitter can exceed the ratio.
+NOISE_FLOOR = 0.01
+MIN_SLOWDOWN = 0.005
+
+# A setup function receives a scale, a seeded random generator and a scratch directory.
+# It prepares the input outside the timed region and returns the call to be timed.
+Setup = Callable[[int, random.Random, str], Callable[[], Any]]
+
+
+@dataclass
+class Benchmark:
+    """A function to be timed on inputs of several sizes."""
+
+    name: str
+    scales: tuple[int, ...]
+    setup: Setup
+
+
+@dataclass
+class Regression:
+    """A benchmark that has slowed down past the allowed ratio."""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        """How many times slower the benchmark has become."""
+
+        return self.current / self.baseline
+
+
+def write_input(directory: str, name: str, lines: list[str]) -> str:
+    """Write generated lines to a file in a scratch directory and return its path."""
+
+    file_path = path.join(directory, name)
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines))
+
+    return file_path
+
+
+def generate_parens(size: int, rng: random.Random) -> str:
+    """Generate a stream of floor instructions for day 1."""
+
+    return "".join(rng.choice("()") for _ in range(size))
+
+
+def generate_presents(size: int, rng: random.Random) -> list[str]:
+    """Generate a manifest of present dimensions for day 2."""
+
+    return [
+        f"{rng.randint(1, 30)}x{rng.randint(1, 30)}x{rng.randint(1, 30)}"
+        for _ in range(size)
+    ]
+
+
+def generate_light_commands(size: int, rng: random.Random, grid_size: int) -> list[str]:
+    """Generate a log of light commands for day 6."""
+
+    lines = []
+
+    for _ in range(size):
+        command = rng.choice(["turn on", "turn off", "toggle"])
+        start_x, end_x = sorted(rng.randrange(grid_size) for _ in range(2))
+        start_y, end_y = sorted(rng.randrange(grid_size) for _ in range(2))
+        lines.append(f"{command} {start_x},{start_y} through {end_x},{end_y}")
+
+    return lines
+
+
+def generate_city_graph(size: int, rng: random.Random) -> list[str]:
+    """Generate the routes of a complete graph of cities for day 9."""
+
+    cities = [
+        "".join(rng.choice(string.ascii_letters) for _ in range(8)) + str(index)
+        for index in range(size)
+    ]
+
+    return [
+        f"{city1} to {city2} = {rng.randint(1, 200)}"
+        for index, city1 in enumerate(cities)
+        for city2 in cities[index + 1 :]
+    ]
+
+
+def generate_reindeer(size: int, rng: random.Random) -> list[str]:
+    """Generate reindeer descriptions for day 14."""
+
+    return [
+        f"Deer{index} can fly {rng.randint(1, 30)} km/s for {rng.randint(1, 20)} seconds, "
+        f"but then must rest for {rng.randint(10, 200)} seconds."
+        for index in range(size)
+    ]
+
+
+def generate_sues(size: int, rng: random.Random, property_names: tuple[str, ...]) -> list[str]:
+    """Generate descriptions of Aunt Sues for day 16."""
+
+    lines = []
+
+    for number in range(1, size + 1):
+        properties = rng.sample(property_names, 3)
+        description = ", ".join(f"{key}: {rng.randint(0, 10)}" for key in properties)
+        lines.append(f"Sue {number}: {description}")
+
+    return lines
+
+
+def setup_find_final_floor(scale: int, rng: random.Random, _: str) -> Callable[[], Any]:
+    """Time finding the final floor of a generated paren stream."""
+
+    day1 = import_day(1)
+    instructions = generate_parens(scale, rng)
+
+    return lambda: day1.find_final_floor(instructions)
+
+
+def setup_read_presents(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time reading a generated present manifest."""
+
+    day2 = import_day(2)
+    file_path = write_input(directory, "presents.txt", generate_presents(scale, rng))
+
+    return lambda: day2.read_presents(file_path)
+
+
+def setup_get_total_ribbon(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time totalling the ribbon for a generated present manifest."""
+
+    day2 = import_day(2)
+    file_path = write_input(directory, "presents.txt", generate_presents(scale, rng))
+    presents = day2.read_presents(file_path)
+
+    return lambda: day2.get_total_ribbon(presents)
+
+
+def setup_read_raw_commands(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time reading a generated light command log."""
+
+    day6 = import_day(6)
+    lines = generate_light_commands(scale, rng, day6.WIDTH)
+    file_path = write_input(directory, "commands.txt", lines)
+
+    return lambda: day6.read_raw_commands(file_path)
+
+
+def setup_execute_command(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time executing a generated light command log on a grid."""
+
+    day6 = import_day(6)
+    lines = generate_light_commands(scale, rng, day6.WIDTH)
+    raw_commands = day6.read_raw_commands(write_input(directory, "commands.txt", lines))
+
+    def execute_all() -> Any:
+        grid = day6.np.full((day6.HEIGHT, day6.WIDTH), 0)
+        for command_type, start, end in raw_commands:
+            grid = day6.execute_command(grid, day6.COMMAND_MAP_V2[command_type], start, end)
+        return grid
+
+    return execute_all
+
+
+def setup_read_routes(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time reading the routes of a generated city graph."""
+
+    day9 = import_day(9)
+    file_path = write_input(directory, "routes.txt", generate_city_graph(scale, rng))
+
+    return lambda: day9.read_routes(file_path)
+
+
+def setup_look_and_say_n_times(scale: int, _: random.Random, __: str) -> Callable[[], Any]:
+    """Time applying look-and-say to the puzzle input a number of times."""
+
+    day10 = import_day(10)
+
+    return lambda: day10.look_and_say_n_times(day10.INPUT_SEQUENCE, scale)
+
+
+def setup_find_winning_reindeer_by_points(
+    scale: int, rng: random.Random, directory: str,
+) -> Callable[[], Any]:
+    """Time scoring a race between generated reindeer."""
+
+    day14 = import_day(14)
+    reindeer = day14.read_reindeer_data(
+        write_input(directory, "reindeer.txt", generate_reindeer(scale, rng)),
+    )
+
+    return lambda: day14.find_winning_reindeer_by_points(reindeer, 500)
+
+
+def setup_read_sues(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time reading a generated list of Aunt Sues."""
+
+    day16 = import_day(16)
+    lines = generate_sues(scale, rng, day16.PROPERTY_NAMES)
+    file_path = write_input(directory, "sues.txt", lines)
+
+    return lambda: day16.read_sues(file_path)
+
+
+def setup_find_matching_sue(scale: int, rng: random.Random, directory: str) -> Callable[[], Any]:
+    """Time searching a generated list of Aunt Sues with no match."""
+
+    day16 = import_day(16)
+    lines = generate_sues(scale, rng, day16.PROPERTY_NAMES)
+    sues = day16.read_sues(write_input(directory, "sues.txt", lines))
+
+    # NOTE: No generated Sue can match a target outside the generated range of values,
+    # so every candidate is checked.
+    target = day16.Sue(0, **{key: 11 for key in day16.PROPERTY_NAMES})
+
+    return lambda: day16.find_matching_sue(sues, target)
+
+
+BENCHMARKS = [
+    Benchmark("day1.find_final_floor", (10_000, 100_000, 1_000_000), setup_find_final_floor),
+    Benchmark("day2.read_presents", (1_000, 10_000, 100_000), setup_read_presents),
+    Benchmark("day2.get_total_ribbon", (1_000, 10_000, 100_000), setup_get_total_ribbon),
+    Benchmark("day6.read_raw_commands", (300, 3_000, 30_000), setup_read_raw_commands),
+    Benchmark("day6.execute_command", (300, 3_000, 30_000), setup_execute_command),
+    Benchmark("day9.read_routes", (10, 100, 300), setup_read_routes),
+    Benchmark("day10.look_and_say_n_times", (20, 30, 40), setup_look_and_say_n_times),
+    Benchmark(
+        "day14.find_winning_reindeer_by_points",
+        (5, 20, 50),
+        setup_find_winning_reindeer_by_points,
+    ),
+    Benchmark("day16.read_sues", (1_000, 10_000, 100_000), setup_read_sues),
+    Benchmark("day16.find_matching_sue", (1_000, 10_000, 100_000), setup_find_matching_sue),
+]
+
+
+def get_benchmark_key(name: str, scale: int) -> str:
+    """Build the key under which a benchmark's timing is stored."""
+
+    return f"{name}[{scale}]"
+
+
+def time_call(call: Callable[[], Any], repeat: int) -> float:
+    """Time a call several times and return the fastest run.
+
+    An untimed call comes first, so that imports, caches and allocations made on first
+    use are not counted.
+    """
+
+    call()
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def run_benchmarks(
+    selected: Optional[list[str]] = None,
+    repeat: int = DEFAULT_REPEAT,
+    seed: int = SEED,
+) -> dict[str, float]:
+    """Run the benchmarks and return their timings in seconds.
+
+    Benchmarks can be narrowed down to a selection of names or days, e.g. "day2".
+    """
+
+    timings = {}
+
+    with TemporaryDirectory() as directory:
+        for benchmark in BENCHMARKS:
+            if selected and not any(
+                benchmark.name == name or benchmark.name.startswith(f"{name}.")
+                for name in selected
+            ):
+                continue
+
+            for scale in benchmark.scales:
+                rng = random.Random(f"{seed}:{benchmark.name}:{scale}")
+                call = benchmark.setup(scale, rng, directory)
+                timings[get_benchmark_key(benchmark.name, scale)] = time_call(call, repeat)
+
+    return timings
+
+
+def read_baseline(file_path: str = BASELINE_FILE) -> dict[str, float]:
+    """Read stored benchmark timings, if there are any."""
+
+    if not path.exists(file_path):
+        return {}
+
+    with open(file_path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def write_baseline(timings: dict[str, float], file_path: str = BASELINE_FILE) -> None:
+    """Store benchmark timings, keeping any stored timings that were not rerun."""
+
+    baseline = read_baseline(file_path) | timings
+
+    makedirs(path.dirname(file_path), exist_ok=True)
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2, sort_keys=True)
+        file.write("\n")
+
+
+def find_unguarded_benchmarks(timings: dict[str, float]) -> list[str]:
+    """Find the benchmarks whose every timed scale is below the noise floor.
+
+    These can never be reported as regressions, so their scales should be raised.
+    """
+
+    slowest: dict[str, float] = {}
+
+    for key, current in timings.items():
+        name = key.partition("[")[0]
+        slowest[name] = max(slowest.get(name, 0.0), current)
+
+    return [name for name, current in slowest.items() if current < NOISE_FLOOR]
+
+
+def find_regressions(
+    timings: dict[str, float],
+    baseline: dict[str, float],
+    max_ratio: float = DEFAULT_MAX_RATIO,
+) -> list[Regression]:
+    """Find the benchmarks that have slowed down past the allowed ratio and by more than noise."""
+
+    regressions = []
+
+    for key, current in timings.items():
+        stored = baseline.get(key)
+        if stored is None or max(stored, current) < NOISE_FLOOR:
+            continue
+
+        if current > stored * max_ratio and current - stored >= MIN_SLOWDOWN:
+            regressions.append(Regression(key, stored, current))
+
+    return regressions
@@ -0,0 +1,386 @@
+"""
+Advent of Code 2015
+Cache parsed puzzle inputs on disk, keyed by the contents of the input and the parser.
+"""
+
+import hashlib
+import math
+import os
+import struct
+from collections.abc import Callable, Iterator, Sequence
+from functools import wraps
+from os import makedirs, path
+from tempfile import NamedTemporaryFile
+from types import ModuleType
+from typing import Any, NamedTuple, Union
+from zipfile import ZIP_STORED, ZipFile
+
+import numpy as np
+
+from aoc2015 import REPO_ROOT
+
+CACHE_DIRECTORY = path.join(REPO_ROOT, ".cache", "parsed")
+DEFAULT_MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+# NOTE: Bump this when the on-disk layout of any codec changes. Changes to the parsers
+# themselves are picked up from the source of their modules.
+CACHE_FORMAT_VERSION = 2
+
+HASH_CHUNK_SIZE = 1024 * 1024
+ROW_BLOCK_SIZE = 4096
+ZIP_LOCAL_HEADER_SIZE = 30
+
+Reader = Callable[[str], Any]
+
+
+class Codec(NamedTuple):
+    """Converts a parsed input to and from its on-disk form."""
+
+    extension: str
+    save: Callable[[ModuleType, Any, str], None]
+    load: Callable[[ModuleType, str], Any]
+
+
+def hash_file(file_path: str) -> str:
+    """Hash the contents of a file."""
+
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def hash_module_source(module: ModuleType) -> str:
+    """Hash the source of a module, which versions every function defined in it."""
+
+    with open(module.__file__, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def save_array(array: np.ndarray, file_path: str) -> None:
+    """Save an array in NumPy's binary format."""
+
+    with open(file_path, "wb") as file:
+        np.save(file, array, allow_pickle=False)
+
+
+def load_array(file_path: str) -> np.ndarray:
+    """Load an array saved in NumPy's binary format without reading it into memory."""
+
+    return np.load(file_path, mmap_mode="r", allow_pickle=False)
+
+
+def save_arrays(file_path: str, **arrays: np.ndarray) -> None:
+    """Save several arrays in an uncompressed archive of NumPy's binary format."""
+
+    with open(file_path, "wb") as file:
+        np.savez(file, **arrays)
+
+
+def load_arrays(file_path: str) -> dict[str, np.ndarray]:
+    """Load the arrays of an uncompressed archive without reading them into memory.
+
+    `np.load` reads each member of an archive whole, but an uncompressed member is just
+    an array in NumPy's binary format at a known offset, so it can be mapped directly.
+    """
+
+    arrays = {}
+
+    with ZipFile(file_path) as archive, open(file_path, "rb") as file:
+        for info in archive.infolist():
+            if info.compress_type != ZIP_STORED:
+                raise ValueError(f"Cannot map compressed member {info.filename} of {file_path}")
+
+            file.seek(info.header_offset)
+            local_header = file.read(ZIP_LOCAL_HEADER_SIZE)
+            name_length, extra_length = struct.unpack("<HH", local_header[26:30])
+            file.seek(info.header_offset + ZIP_LOCAL_HEADER_SIZE + name_length + extra_length)
+
+            version = np.lib.format.read_magic(file)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(file)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(file)
+
+            name = path.splitext(info.filename)[0]
+            # NOTE: An empty range cannot be mapped.
+            if math.prod(shape) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+            else:
+                arrays[name] = np.memmap(
+                    file_path,
+                    dtype=dtype,
+                    mode="r",
+                    offset=file.tell(),
+                    shape=shape,
+                    order="F" if fortran_order else "C",
+                )
+
+    return arrays
+
+
+class MappedRecords(Sequence):
+    """A read-only sequence of records, built from the rows of a table only when accessed.
+
+    The table is usually memory-mapped, so loading a cached input costs no more than
+    opening it. Records are built a block of rows at a time as they are first reached,
+    and kept, so that iterating again returns the same objects.
+    """
+
+    def __init__(self, table: np.ndarray, build_record: Callable[[list[Any]], Any]) -> None:
+        """Initialize the sequence from a table with one row per record."""
+
+        self.table = table
+        self.build_record = build_record
+        self.blocks: dict[int, list[Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self.table)
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return MappedRecords(self.table[index], self.build_record)
+
+        index = range(len(self))[index]
+        block_start = index - index % ROW_BLOCK_SIZE
+
+        return self.get_block(block_start)[index - block_start]
+
+    def __iter__(self) -> Iterator[Any]:
+        for block_start in range(0, len(self), ROW_BLOCK_SIZE):
+            yield from self.get_block(block_start)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+    def get_block(self, block_start: int) -> list[Any]:
+        """Build, or look up, the records of a block of rows."""
+
+        block = self.blocks.get(block_start)
+
+        if block is None:
+            # NOTE: Converting a block of rows at a time keeps the per-record cost close
+            # to that of a single `tolist()` without building every record up front.
+            rows = self.table[block_start : block_start + ROW_BLOCK_SIZE].tolist()
+            block = self.blocks[block_start] = list(map(self.build_record, rows))
+
+        return block
+
+
+def save_presents(module: ModuleType, presents: list[Any], file_path: str) -> None:
+    """Save presents as a (presents x 3) table of dimensions."""
+
+    table = np.array(
+        [(present.length, present.width, present.height) for present in presents],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    save_array(table, file_path)
+
+
+def load_presents(module: ModuleType, file_path: str) -> MappedRecords:
+    """Load presents lazily from a memory-mapped table of dimensions."""
+
+    return MappedRecords(load_array(file_path), lambda dimensions: module.Present(*dimensions))
+
+
+def save_raw_commands(module: ModuleType, raw_commands: list[Any], file_path: str) -> None:
+    """Save light commands as a (commands x 5) table of command types and coordinates."""
+
+    command_types = list(module.CommandType)
+    table = np.array(
+        [
+            (command_types.index(command_type), *start, *end)
+            for command_type, start, end in raw_commands
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 5)
+    save_array(table, file_path)
+
+
+def load_raw_commands(module: ModuleType, file_path: str) -> MappedRecords:
+    """Load light commands lazily from a memory-mapped table of types and coordinates."""
+
+    command_types = list(module.CommandType)
+
+    def build_raw_command(row: list[int]) -> Any:
+        command_type, start_x, start_y, end_x, end_y = row
+        return command_types[command_type], (start_x, start_y), (end_x, end_y)
+
+    return MappedRecords(load_array(file_path), build_raw_command)
+
+
+def save_routes(module: ModuleType, routes: list[Any], file_path: str) -> None:
+    """Save routes as a table of city names and a (routes x 3) table of cities and distances."""
+
+    cities = list(dict.fromkeys(city for route in routes for city in route[:2]))
+    city_indices = {city: index for index, city in enumerate(cities)}
+    columns = np.array(
+        [(city_indices[city1], city_indices[city2], distance) for city1, city2, distance in routes],
+        dtype=np.int64,
+    ).reshape(-1, 3)
+    save_arrays(file_path, strings=np.array(cities, dtype=str), columns=columns)
+
+
+def load_routes(module: ModuleType, file_path: str) -> MappedRecords:
+    """Load routes lazily from memory-mapped tables of city names, cities and distances."""
+
+    arrays = load_arrays(file_path)
+    cities = arrays["strings"]
+
+    def build_route(row: list[int]) -> Any:
+        city1, city2, distance = row
+        return module.Route(str(cities[city1]), str(cities[city2]), distance)
+
+    return MappedRecords(arrays["columns"], build_route)
+
+
+def save_reindeer(module: ModuleType, reindeer: list[Any], file_path: str) -> None:
+    """Save reindeer as a table of names and a (reindeer x 4) table of names and speeds."""
+
+    columns = np.array(
+        [
+            (index, deer.speed, deer.fly_time, deer.rest_time)
+            for index, deer in enumerate(reindeer)
+        ],
+        dtype=np.int64,
+    ).reshape(-1, 4)
+    names = np.array([deer.name for deer in reindeer], dtype=str)
+    save_arrays(file_path, strings=names, columns=columns)
+
+
+def load_reindeer(module: ModuleType, file_path: str) -> MappedRecords:
+    """Load reindeer lazily from memory-mapped tables of names and speeds."""
+
+    arrays = load_arrays(file_path)
+    names = arrays["strings"]
+
+    def build_reindeer(row: list[int]) -> Any:
+        name, speed, fly_time, rest_time = row
+        return module.Reindeer(str(names[name]), speed, fly_time, rest_time)
+
+    return MappedRecords(arrays["columns"], build_reindeer)
+
+
+def save_sues(module: ModuleType, sues: list[Any], file_path: str) -> None:
+    """Save Aunt Sues as a table of their numbers, property values and known properties."""
+
+    numbers, values, known = module.build_sue_matrix(sues)
+    columns = np.column_stack([numbers, values, known]).astype(np.int64)
+    save_arrays(file_path, columns=columns)
+
+
+def load_sues(module: ModuleType, file_path: str) -> MappedRecords:
+    """Load Aunt Sues lazily from a memory-mapped table of their properties."""
+
+    property_names = module.PROPERTY_NAMES
+    property_count = len(property_names)
+
+    def build_sue(row: list[int]) -> Any:
+        values = row[1 : property_count + 1]
+        known = row[property_count + 1 :]
+        properties = {
+            name: value for name, value, is_known in zip(property_names, values, known) if is_known
+        }
+        return module.Sue(row[0], **properties)
+
+    return MappedRecords(load_arrays(file_path)["columns"], build_sue)
+
+
+CODECS = {
+    ("day2.main", "read_presents"): Codec(".npy", save_presents, load_presents),
+    ("day6.main", "read_raw_commands"): Codec(".npy", save_raw_commands, load_raw_commands),
+    ("day9.main", "read_routes"): Codec(".npz", save_routes, load_routes),
+    ("day14.main", "read_reindeer_data"): Codec(".npz", save_reindeer, load_reindeer),
+    ("day16.main", "read_sues"): Codec(".npz", save_sues, load_sues),
+}
+
+
+def touch(file_path: str) -> None:
+    """Mark a cache entry as recently used."""
+
+    os.utime(file_path)
+
+
+def evict_least_recently_used(directory: str, max_bytes: int) -> None:
+    """Delete the least recently used files in a directory until it fits in a size."""
+
+    entries = []
+
+    for entry in os.scandir(directory):
+        if entry.is_file():
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_bytes = sum(size for _, size, _ in entries)
+
+    for _, size, file_path in sorted(entries):
+        if total_bytes <= max_bytes:
+            break
+
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+        total_bytes -= size
+
+
+def write_atomically(save: Callable[[str], None], file_path: str) -> None:
+    """Write a file so that concurrent readers never see it partially written."""
+
+    directory = path.dirname(file_path)
+    with NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as file:
+        temporary_path = file.name
+
+    try:
+        save(temporary_path)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def cache_reader(
+    module: ModuleType,
+    name: str,
+    directory: str = CACHE_DIRECTORY,
+    max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+) -> Reader:
+    """Wrap one of a module's readers so that its parsed output is cached on disk."""
+
+    reader = getattr(module, name)
+    codec = CODECS[(module.__name__, name)]
+    parser_version = f"{CACHE_FORMAT_VERSION}:{hash_module_source(module)}"
+
+    @wraps(reader)
+    def cached_reader(file_path: str) -> Any:
+        key = hashlib.sha256(
+            f"{module.__name__}.{name}:{parser_version}:{hash_file(file_path)}".encode(),
+        ).hexdigest()
+        cache_path = path.join(directory, key + codec.extension)
+
+        if path.exists(cache_path):
+            touch(cache_path)
+            return codec.load(module, cache_path)
+
+        parsed = reader(file_path)
+
+        makedirs(directory, exist_ok=True)
+        write_atomically(lambda temporary_path: codec.save(module, parsed, temporary_path), cache_path)
+        evict_least_recently_used(directory, max_bytes)
+
+        return parsed
+
+    return cached_reader
+
+
+def get_cached_readers(module: ModuleType) -> dict[str, Reader]:
+    """Wrap every reader of a module that has a cache codec."""
+
+    return {
+        name: cache_reader(module, name)
+        for module_name, name in CODECS
+        if module_name == module.__name__
+    }
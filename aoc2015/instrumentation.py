@@ -0,0 +1,166 @@
+"""
+Advent of Code 2015
+Opt-in call statistics for the hot loops of the daily solutions.
+
+Nothing here is installed unless instrumentation is requested, so uninstrumented runs
+call the solutions' functions directly.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from functools import wraps
+from types import ModuleType
+from typing import Any, Optional
+
+# NOTE: Setting this variable to a file path turns instrumentation on for runs that
+# were not given an explicit report path.
+ENVIRONMENT_VARIABLE = "AOC2015_INSTRUMENT"
+
+# Counts how many items a call processes, given the same arguments as the call.
+ItemCounter = Callable[..., int]
+
+
+def count_call(*_: Any, **__: Any) -> int:
+    """Count each call as a single item."""
+
+    return 1
+
+
+def count_sequence_digits(sequence: str) -> int:
+    """Count the digits of a look-and-say sequence."""
+
+    return len(sequence)
+
+
+def count_command_cells(grid: Any, command: Any, start: tuple[int, int], end: tuple[int, int]) -> int:
+    """Count the lights a command is applied to."""
+
+    # NOTE: Coordinates may arrive as NumPy integers, which the JSON report cannot hold.
+    return int((end[0] - start[0] + 1) * (end[1] - start[1] + 1))
+
+
+def count_candidates(candidates: list[Any], *_: Any, **__: Any) -> int:
+    """Count the candidates searched for a match."""
+
+    return len(candidates)
+
+
+INSTRUMENTED_FUNCTIONS: dict[str, dict[str, ItemCounter]] = {
+    "day3.main": {"advance_position": count_call},
+    "day4.main": {"find_md5_hash": count_call},
+    "day6.main": {"execute_command": count_command_cells},
+    "day10.main": {"look_and_say": count_sequence_digits},
+    "day16.main": {"find_matching_sue": count_candidates},
+}
+
+# Functions that build the functions doing the work, e.g. day 16's compiled matchers,
+# which replaced `sue_matches_target` in the per-candidate loop. Every function they
+# return is instrumented, and their calls are reported together as "<factory>()".
+INSTRUMENTED_FACTORIES: dict[str, dict[str, ItemCounter]] = {
+    "day16.main": {"compile_matcher": count_call},
+}
+
+
+@dataclass
+class FunctionStats:
+    """Statistics gathered about the calls to a single function.
+
+    Calls may be recorded from several threads at once, e.g. from the bands of day 6.
+    """
+
+    calls: int = 0
+    total_time: float = 0.0
+    items: int = 0
+    # Per-call times, bucketed by the number of bits in their duration in nanoseconds.
+    histogram: Counter = field(default_factory=Counter)
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, elapsed_ns: int, items: int) -> None:
+        """Record a single call."""
+
+        with self.lock:
+            self.calls += 1
+            self.total_time += elapsed_ns / 1e9
+            self.items += items
+            self.histogram[elapsed_ns.bit_length()] += 1
+
+    def to_report(self) -> dict[str, Any]:
+        """Summarize the statistics for a report."""
+
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "mean_time": self.total_time / self.calls if self.calls else 0.0,
+            "items": self.items,
+            "items_per_second": self.items / self.total_time if self.total_time else 0.0,
+            "histogram_ns": {
+                f"<{1 << bits}": count for bits, count in sorted(self.histogram.items())
+            },
+        }
+
+
+def get_report_path(requested: Optional[str] = None) -> Optional[str]:
+    """Determine where the instrumentation report should go, if anywhere."""
+
+    return requested or os.environ.get(ENVIRONMENT_VARIABLE) or None
+
+
+def instrument(function: Callable[..., Any], stats: FunctionStats, count_items: ItemCounter) -> Callable[..., Any]:
+    """Wrap a function so that every call to it is recorded."""
+
+    @wraps(function)
+    def instrumented(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter_ns()
+        result = function(*args, **kwargs)
+        stats.record(time.perf_counter_ns() - start, count_items(*args, **kwargs))
+        return result
+
+    return instrumented
+
+
+def instrument_factory(
+    factory: Callable[..., Callable[..., Any]],
+    stats: FunctionStats,
+    count_items: ItemCounter,
+) -> Callable[..., Callable[..., Any]]:
+    """Wrap a function so that every call to the functions it returns is recorded."""
+
+    @wraps(factory)
+    def instrumented_factory(*args: Any, **kwargs: Any) -> Callable[..., Any]:
+        return instrument(factory(*args, **kwargs), stats, count_items)
+
+    return instrumented_factory
+
+
+def get_instrumented_functions(module: ModuleType) -> tuple[dict[str, Callable[..., Any]], dict[str, FunctionStats]]:
+    """Wrap the hot functions of a module.
+
+    Returns the wrappers by name, to be patched into the module, and the statistics they record.
+    """
+
+    replacements = {}
+    stats = {}
+
+    for name, count_items in INSTRUMENTED_FUNCTIONS.get(module.__name__, {}).items():
+        stats[name] = FunctionStats()
+        replacements[name] = instrument(getattr(module, name), stats[name], count_items)
+
+    for name, count_items in INSTRUMENTED_FACTORIES.get(module.__name__, {}).items():
+        stats_name = f"{name}()"
+        stats[stats_name] = FunctionStats()
+        replacements[name] = instrument_factory(getattr(module, name), stats[stats_name], count_items)
+
+    return replacements, stats
+
+
+def write_report(report: dict[str, Any], file_path: str) -> None:
+    """Write an instrumentation report as JSON."""
+
+    with open(file_path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+        file.write("\n")
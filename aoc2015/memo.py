@@ -0,0 +1,90 @@
+"""
+Advent of Code 2015
+Persist the answers of slow solvers on disk so unchanged work is never repeated.
+"""
+
+import hashlib
+import pickle
+from collections.abc import Callable
+from functools import wraps
+from inspect import getsourcefile
+from os import makedirs, path
+from types import ModuleType
+from typing import Any, TypeVar
+
+from aoc2015 import REPO_ROOT
+from aoc2015.cache import evict_least_recently_used, touch, write_atomically
+
+RESULTS_DIRECTORY = path.join(REPO_ROOT, ".cache", "results")
+DEFAULT_MAX_RESULTS_BYTES = 256 * 1024 * 1024
+
+# NOTE: The solutions are run as standalone scripts, so they can't import this package
+# to decorate themselves. The runner applies the decorator to these entry points instead.
+MEMOIZED_FUNCTIONS = {
+    "day4.main": ["find_lowest_number_with_hash_starting_with_n_zeroes"],
+    "day10.main": ["look_and_say_n_times"],
+}
+
+Function = TypeVar("Function", bound=Callable[..., Any])
+
+
+def hash_source(function: Callable[..., Any]) -> str:
+    """Hash the source file a function is defined in."""
+
+    with open(getsourcefile(function), "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def persistent_memo(
+    directory: str = RESULTS_DIRECTORY,
+    max_bytes: int = DEFAULT_MAX_RESULTS_BYTES,
+) -> Callable[[Function], Function]:
+    """Cache a function's results on disk.
+
+    Results are keyed by the function's name, its arguments and the source of its
+    module, so editing the solver or changing its input invalidates them. The least
+    recently used results are evicted once the cache grows past `max_bytes`.
+    """
+
+    def decorator(function: Function) -> Function:
+        name = f"{function.__module__}.{function.__qualname__}"
+        source_hash = hash_source(function)
+
+        @wraps(function)
+        def memoized(*args: Any, **kwargs: Any) -> Any:
+            arguments = pickle.dumps((args, sorted(kwargs.items())), protocol=pickle.HIGHEST_PROTOCOL)
+            digest = hashlib.sha256(f"{name}:{source_hash}:".encode())
+            digest.update(arguments)
+            result_path = path.join(directory, digest.hexdigest() + ".pkl")
+
+            if path.exists(result_path):
+                touch(result_path)
+                with open(result_path, "rb") as file:
+                    return pickle.load(file)
+
+            result = function(*args, **kwargs)
+
+            def save(temporary_path: str) -> None:
+                with open(temporary_path, "wb") as file:
+                    pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            makedirs(directory, exist_ok=True)
+            write_atomically(save, result_path)
+            evict_least_recently_used(directory, max_bytes)
+
+            return result
+
+        return memoized
+
+    return decorator
+
+
+def get_memoized_functions(module: ModuleType) -> dict[str, Callable[..., Any]]:
+    """Wrap the entry points of a module that opt in to persistent memoization."""
+
+    memo = persistent_memo()
+
+    return {
+        name: memo(getattr(module, name))
+        for name in MEMOIZED_FUNCTIONS.get(module.__name__, [])
+    }
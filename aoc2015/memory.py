@@ -0,0 +1,184 @@
+"""
+Advent of Code 2015
+Memory profiling of the daily solutions, split into parsing and solving phases.
+"""
+
+import _thread
+import threading
+import tracemalloc
+from collections.abc import Callable
+from functools import wraps
+from typing import Any, Optional
+
+PARSE_PHASE = "parse"
+SOLVE_PHASE = "solve"
+
+POLL_INTERVAL = 0.01
+TOP_ALLOCATION_COUNT = 10
+
+# NOTE: A new snapshot is only taken once traced memory grows by this factor over the
+# last one, which bounds the number of (expensive) snapshots taken per phase.
+SNAPSHOT_GROWTH_FACTOR = 1.25
+
+# NOTE: Allocation sites are excluded after grouping rather than by filtering snapshots,
+# since filtering walks every trace in Python and is far too slow for large heaps.
+EXCLUDED_FILENAMES = frozenset([
+    __file__,
+    tracemalloc.__file__,
+    "<frozen importlib._bootstrap>",
+    "<frozen importlib._bootstrap_external>",
+])
+
+
+class MemoryProfiler:
+    """Tracks peak memory and the largest allocation sites of each phase of a run.
+
+    Everything outside the wrapped readers is attributed to solving. Allocation sites
+    are measured against a snapshot taken as the phase began, so memory still held from
+    an earlier phase is not reported again. When a budget is given, the main thread is
+    interrupted as soon as traced memory exceeds it.
+    """
+
+    def __init__(self, budget_bytes: Optional[int] = None) -> None:
+        """Initialize the profiler with an optional memory budget."""
+
+        self.budget_bytes = budget_bytes
+        self.budget_exceeded = False
+        self.phase = SOLVE_PHASE
+        self.depth = 0
+        self.peaks = {PARSE_PHASE: 0, SOLVE_PHASE: 0}
+        self.phase_start: Optional[tracemalloc.Snapshot] = None
+        # Each phase's largest snapshot, paired with the snapshot from when it began.
+        self.snapshots: dict[str, tuple[tracemalloc.Snapshot, tracemalloc.Snapshot]] = {}
+        self.snapshot_sizes = {PARSE_PHASE: 0, SOLVE_PHASE: 0}
+        self.stopped = threading.Event()
+        self.monitor = threading.Thread(target=self.watch, daemon=True)
+
+    def start(self) -> None:
+        """Start tracing allocations."""
+
+        tracemalloc.start()
+        self.phase_start = tracemalloc.take_snapshot()
+        self.monitor.start()
+
+    def stop(self) -> None:
+        """Stop tracing allocations, recording the final phase."""
+
+        self.stopped.set()
+        self.monitor.join()
+        self.end_phase()
+        tracemalloc.stop()
+
+    def end_phase(self) -> None:
+        """Record the peak of the current phase and start measuring afresh."""
+
+        current, peak = tracemalloc.get_traced_memory()
+        self.peaks[self.phase] = max(self.peaks[self.phase], peak)
+        if self.phase not in self.snapshots:
+            self.take_snapshot(self.phase, current)
+        tracemalloc.reset_peak()
+
+    def switch_phase(self, phase: str) -> None:
+        """Attribute subsequent allocations to a different phase."""
+
+        self.end_phase()
+        self.phase_start = tracemalloc.take_snapshot()
+        self.phase = phase
+
+    def take_snapshot(self, phase: str, size: int) -> None:
+        """Record the live allocations of a phase, along with those from when it began."""
+
+        self.snapshots[phase] = (self.phase_start, tracemalloc.take_snapshot())
+        self.snapshot_sizes[phase] = size
+
+    def watch(self) -> None:
+        """Poll traced memory, taking snapshots near each phase's peak and enforcing the budget."""
+
+        while not self.stopped.wait(POLL_INTERVAL):
+            phase = self.phase
+            current, _ = tracemalloc.get_traced_memory()
+
+            if current > self.snapshot_sizes[phase] * SNAPSHOT_GROWTH_FACTOR:
+                self.take_snapshot(phase, current)
+
+            if self.budget_bytes is not None and current > self.budget_bytes:
+                self.take_snapshot(phase, current)
+                self.budget_exceeded = True
+                _thread.interrupt_main()
+                return
+
+    def wrap(self, reader: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a reader so that its allocations are attributed to parsing."""
+
+        @wraps(reader)
+        def profiled_reader(*args: Any, **kwargs: Any) -> Any:
+            if self.depth:
+                return reader(*args, **kwargs)
+
+            self.depth += 1
+            self.switch_phase(PARSE_PHASE)
+            try:
+                return reader(*args, **kwargs)
+            finally:
+                self.switch_phase(SOLVE_PHASE)
+                self.depth -= 1
+
+        return profiled_reader
+
+    def get_top_allocations(self, phase: str) -> list[dict[str, Any]]:
+        """List the sites that allocated the most memory during a phase."""
+
+        if phase not in self.snapshots:
+            return []
+
+        start, snapshot = self.snapshots[phase]
+        differences = sorted(
+            snapshot.compare_to(start, "lineno"),
+            key=lambda difference: difference.size_diff,
+            reverse=True,
+        )
+        allocations = []
+
+        for difference in differences:
+            if difference.size_diff <= 0:
+                break
+
+            frame = difference.traceback[0]
+            if frame.filename in EXCLUDED_FILENAMES:
+                continue
+
+            allocations.append({
+                "site": f"{frame.filename}:{frame.lineno}",
+                "size_bytes": difference.size_diff,
+                "count": difference.count_diff,
+            })
+            if len(allocations) == TOP_ALLOCATION_COUNT:
+                break
+
+        return allocations
+
+    def to_report(self) -> dict[str, Any]:
+        """Summarize the peaks and allocation sites of every phase."""
+
+        return {
+            "budget_bytes": self.budget_bytes,
+            "budget_exceeded": self.budget_exceeded,
+            "phases": {
+                phase: {
+                    "peak_bytes": peak,
+                    "top_allocations": self.get_top_allocations(phase),
+                }
+                for phase, peak in self.peaks.items()
+            },
+        }
+
+    def describe_budget_overrun(self) -> str:
+        """Describe where memory went when the budget was exceeded."""
+
+        sites = self.get_top_allocations(self.phase)[:3]
+        summary = ", ".join(f"{site['site']} ({site['size_bytes']} B)" for site in sites)
+
+        return (
+            f"Memory budget of {self.budget_bytes} bytes exceeded while in the "
+            f"{self.phase} phase. Largest allocation sites: {summary or 'unknown'}"
+        )
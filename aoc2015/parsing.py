@@ -0,0 +1,264 @@
+"""
+Advent of Code 2015
+Parse whole line-oriented inputs at once into typed columns.
+"""
+
+import re
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, repeat
+from operator import itemgetter, methodcaller
+from typing import TYPE_CHECKING, NamedTuple, Union
+
+import numpy as np
+
+from aoc2015 import import_day
+
+if TYPE_CHECKING:
+    from day16.main import SueMatrix
+
+CHUNK_SIZE = 16 * 1024 * 1024
+
+# Matches a single "key: value" property of an Aunt Sue, or the break between two Sues.
+SUE_PROPERTY_TOKEN_REGEX = re.compile(r"(\w+): (\d+)|\n")
+MAX_REPORTED_LINES = 10
+
+# Integer columns become NumPy arrays, while string columns stay as lists.
+Column = Union[np.ndarray, list[str]]
+
+
+class LineFormat(NamedTuple):
+    """The pattern each line of an input matches, and the type of each captured group."""
+
+    regex: re.Pattern
+    column_types: tuple[type, ...]
+
+
+class MalformedLinesError(ValueError):
+    """Raised when some lines of an input don't match the expected format."""
+
+    def __init__(self, lines: list[tuple[int, str]]) -> None:
+        """Initialize the error with the line numbers and contents of every malformed line."""
+
+        self.lines = lines
+
+        reported = "\n".join(f"  line {number}: {line}" for number, line in lines[:MAX_REPORTED_LINES])
+        omitted = len(lines) - MAX_REPORTED_LINES
+        suffix = f"\n  ... and {omitted} more" if omitted > 0 else ""
+
+        super().__init__(f"{len(lines)} malformed line(s):\n{reported}{suffix}")
+
+
+def get_line_formats() -> dict[str, LineFormat]:
+    """Describe the line-oriented inputs of the daily solutions.
+
+    Aunt Sues list a varying set of properties, so they are parsed by `parse_sues_bulk`.
+    """
+
+    return {
+        "routes": LineFormat(import_day(9).ROUTE_REGEX, (str, str, int)),
+        "reindeer": LineFormat(import_day(14).REINDEER_REGEX, (str, int, int, int)),
+        # NOTE: Day 6 captures each coordinate as a single "x,y" group, so its columns are
+        # split out here instead.
+        "commands": LineFormat(
+            re.compile(r"(turn on|turn off|toggle) (\d+),(\d+) through (\d+),(\d+)"),
+            (str, int, int, int, int),
+        ),
+    }
+
+
+def compile_line_regex(regex: re.Pattern) -> re.Pattern:
+    """Anchor a pattern so that it must match a whole line, ignoring trailing whitespace."""
+
+    return re.compile(rf"^(?:{regex.pattern})[ \t\r]*$", regex.flags | re.MULTILINE)
+
+
+def find_malformed_lines(text: str, line_regex: re.Pattern, first_line_number: int) -> list[tuple[int, str]]:
+    """Find the non-blank lines of a text that don't match a pattern."""
+
+    malformed = []
+
+    for line_number, line in enumerate(text.split("\n"), first_line_number):
+        if line.strip() and not line_regex.fullmatch(line):
+            malformed.append((line_number, line))
+
+    return malformed
+
+
+def convert_column(values: Sequence[str], column_type: type) -> Column:
+    """Convert the captured strings of a single group to their type."""
+
+    if column_type is int:
+        return np.fromiter(map(int, values), dtype=np.int64, count=len(values))
+
+    return list(values)
+
+
+def parse_chunk(
+    text: str,
+    pattern: str,
+    flags: int,
+    column_types: tuple[type, ...],
+    first_line_number: int = 1,
+) -> tuple[list[Column], list[tuple[int, str]]]:
+    """Parse a newline-aligned chunk of text into columns.
+
+    Returns the columns and any malformed lines, numbered from `first_line_number`.
+    """
+
+    line_regex = compile_line_regex(re.compile(pattern, flags))
+    rows = line_regex.findall(text)
+
+    line_count = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    malformed = []
+    if len(rows) != line_count:
+        # NOTE: Blank lines also cause a mismatch, so only now is each line checked.
+        malformed = find_malformed_lines(text, line_regex, first_line_number)
+
+    if len(column_types) == 1:
+        raw_columns = [rows]
+    else:
+        raw_columns = [list(map(itemgetter(index), rows)) for index in range(len(column_types))]
+
+    columns = [
+        convert_column(values, column_type)
+        for values, column_type in zip(raw_columns, column_types)
+    ]
+
+    return columns, malformed
+
+
+def split_into_chunks(text: str, chunk_size: int = CHUNK_SIZE) -> list[tuple[str, int]]:
+    """Split text into newline-aligned chunks, each with the number of its first line."""
+
+    chunks = []
+    start = 0
+    line_number = 1
+
+    while start < len(text):
+        end = text.find("\n", start + chunk_size)
+        end = len(text) if end == -1 else end + 1
+
+        chunks.append((text[start:end], line_number))
+        line_number += text.count("\n", start, end)
+        start = end
+
+    return chunks
+
+
+def concatenate_columns(parts: list[list[Column]], column_types: tuple[type, ...]) -> list[Column]:
+    """Join the columns parsed from several chunks."""
+
+    columns = []
+
+    for index, column_type in enumerate(column_types):
+        pieces = [part[index] for part in parts]
+        if column_type is int:
+            columns.append(np.concatenate(pieces) if pieces else np.empty(0, dtype=np.int64))
+        else:
+            columns.append([value for piece in pieces for value in piece])
+
+    return columns
+
+
+def parse_bulk(
+    text: str,
+    line_format: LineFormat,
+    jobs: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[Column]:
+    """Parse every line of an input into one column per captured group.
+
+    Large inputs are split into newline-aligned chunks which are parsed on a pool of
+    `jobs` processes. Malformed lines are collected and reported together.
+    """
+
+    regex, column_types = line_format
+    if regex.groups != len(column_types):
+        raise ValueError(f"Expected {regex.groups} column types, got {len(column_types)}.")
+
+    chunks = split_into_chunks(text, chunk_size)
+
+    if jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = [
+                executor.submit(parse_chunk, chunk, regex.pattern, regex.flags, column_types, line_number)
+                for chunk, line_number in chunks
+            ]
+            results = [future.result() for future in futures]
+    else:
+        results = [
+            parse_chunk(chunk, regex.pattern, regex.flags, column_types, line_number)
+            for chunk, line_number in chunks
+        ]
+
+    malformed = [line for _, chunk_malformed in results for line in chunk_malformed]
+    if malformed:
+        raise MalformedLinesError(malformed)
+
+    return concatenate_columns([columns for columns, _ in results], column_types)
+
+
+def read_bulk(file_path: str, line_format: LineFormat, jobs: int = 1) -> list[Column]:
+    """Read and parse every line of an input file into typed columns."""
+
+    with open(file_path, encoding="utf-8") as file:
+        return parse_bulk(file.read(), line_format, jobs)
+
+
+def parse_sues_bulk(text: str, jobs: int = 1) -> "SueMatrix":
+    """Parse every Aunt Sue in an input into the `SueMatrix` form used by day 16.
+
+    Each property becomes an integer column, with a mask marking which Sues list it.
+    """
+
+    day16 = import_day(16)
+    numbers, raw_properties = parse_bulk(text, LineFormat(day16.SUE_REGEX, (int, str)), jobs)
+
+    # NOTE: Joining the properties lets one pass of the regex tokenize every Sue, with the
+    # line breaks between them marking which row each property belongs to.
+    tokens = SUE_PROPERTY_TOKEN_REGEX.findall("\n".join(raw_properties))
+    keys = list(map(itemgetter(0), tokens))
+    is_property = np.array(keys) != "" if keys else np.zeros(0, dtype=bool)
+    property_mask = is_property.tolist()
+
+    rows = np.cumsum(~is_property)[is_property]
+    column_of = {key: column for column, key in enumerate(day16.PROPERTY_NAMES)}
+    columns = np.fromiter(
+        map(column_of.get, compress(keys, property_mask), repeat(-1)),
+        dtype=np.int64,
+        count=len(rows),
+    )
+    values = np.fromiter(
+        map(int, compress(map(itemgetter(1), tokens), property_mask)),
+        dtype=np.int64,
+        count=len(rows),
+    )
+
+    expected_counts = np.fromiter(
+        map(methodcaller("count", ", "), raw_properties), dtype=np.int64, count=len(raw_properties),
+    ) + 1
+    malformed_rows = np.bincount(rows, minlength=len(raw_properties)) != expected_counts
+    malformed_rows[rows[columns < 0]] = True
+    if malformed_rows.any():
+        # NOTE: Rows skip blank lines, so they are mapped back to line numbers here.
+        non_blank_lines = [
+            (number, line) for number, line in enumerate(text.split("\n"), 1) if line.strip()
+        ]
+        raise MalformedLinesError(
+            [non_blank_lines[row] for row in np.flatnonzero(malformed_rows).tolist()],
+        )
+
+    matrix_values = np.zeros((len(numbers), len(day16.PROPERTY_NAMES)), dtype=np.int64)
+    known = np.zeros(matrix_values.shape, dtype=bool)
+    matrix_values[rows, columns] = values
+    known[rows, columns] = True
+
+    return day16.SueMatrix(numbers, matrix_values, known)
+
+
+def read_sues_bulk(file_path: str, jobs: int = 1) -> "SueMatrix":
+    """Read and parse every Aunt Sue in an input file into columnar form."""
+
+    with open(file_path, encoding="utf-8") as file:
+        return parse_sues_bulk(file.read(), jobs)
@@ -0,0 +1,267 @@
+"""
+Advent of Code 2015
+Run the daily solutions in parallel and record how long each one takes.
+"""
+
+import csv
+import inspect
+import io
+import json
+import re
+import resource
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, dataclass, fields
+from functools import partial, wraps
+from multiprocessing import get_context
+from os import listdir, path
+from types import ModuleType
+from typing import Any, Optional, TextIO
+
+from aoc2015 import REPO_ROOT, import_day
+from aoc2015.cache import get_cached_readers
+from aoc2015.instrumentation import get_instrumented_functions
+from aoc2015.memo import get_memoized_functions
+from aoc2015.memory import MemoryProfiler
+
+DAY_DIRECTORY_REGEX = re.compile(r"day(\d+)")
+DAY_RANGE_REGEX = re.compile(r"(\d+)(?:-(\d+))?")
+
+# NOTE: Each day's solution reads its input through module-level functions named with
+# this prefix, so time spent inside them is attributed to parsing.
+READER_PREFIX = "read_"
+
+
+@dataclass(frozen=True)
+class RunOptions:
+    """Options that change how each day's solution is run."""
+
+    cache: bool = False
+    memoize: bool = False
+    instrument: bool = False
+    memory_profile: bool = False
+    memory_budget_bytes: Optional[int] = None
+
+
+@dataclass
+class DayResult:
+    """The outcome of running a single day's solution."""
+
+    day: int
+    status: str
+    parse_wall_time: float = 0.0
+    solve_wall_time: float = 0.0
+    parse_cpu_time: float = 0.0
+    solve_cpu_time: float = 0.0
+    peak_rss_kb: int = 0
+    error: Optional[str] = None
+    instrumentation: Optional[dict[str, Any]] = None
+    memory: Optional[dict[str, Any]] = None
+
+
+class PhaseTimer:
+    """Accumulates the wall and CPU time spent parsing input."""
+
+    def __init__(self) -> None:
+        """Initialize the timer with no time recorded."""
+
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.depth = 0
+
+    def wrap(self, reader: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a reader so that the time spent inside it is recorded."""
+
+        @wraps(reader)
+        def timed_reader(*args: Any, **kwargs: Any) -> Any:
+            # NOTE: Readers may call one another, so only the outermost call is timed.
+            if self.depth:
+                return reader(*args, **kwargs)
+
+            self.depth += 1
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            try:
+                return reader(*args, **kwargs)
+            finally:
+                self.wall_time += time.perf_counter() - wall_start
+                self.cpu_time += time.process_time() - cpu_start
+                self.depth -= 1
+
+        return timed_reader
+
+
+def discover_days() -> list[int]:
+    """Find the days that have a solution in the repository."""
+
+    days = []
+
+    for name in listdir(REPO_ROOT):
+        pattern_match = DAY_DIRECTORY_REGEX.fullmatch(name)
+        if pattern_match and path.isfile(path.join(REPO_ROOT, name, "main.py")):
+            days.append(int(pattern_match.group(1)))
+
+    return sorted(days)
+
+
+def parse_day_ranges(text: str) -> list[int]:
+    """Parse a selection of days such as "1-5,9,14"."""
+
+    days = set()
+
+    for segment in text.split(","):
+        pattern_match = DAY_RANGE_REGEX.fullmatch(segment.strip())
+        if not pattern_match:
+            raise ValueError(f"Invalid day range: {segment}")
+
+        first = int(pattern_match.group(1))
+        last = int(pattern_match.group(2) or first)
+        days.update(range(first, last + 1))
+
+    return sorted(days)
+
+
+def get_readers(module: ModuleType) -> dict[str, Callable[..., Any]]:
+    """Find the functions a day's solution uses to read its input.
+
+    Generator functions are left out, since calling one only creates an iterator: timing
+    it would not time the parse, and keeping its result would keep a one-shot iterator.
+    """
+
+    return {
+        name: value
+        for name, value in vars(module).items()
+        if name.startswith(READER_PREFIX)
+        and callable(value)
+        and not inspect.isgeneratorfunction(value)
+    }
+
+
+@contextmanager
+def patched(module: ModuleType, replacements: dict[str, Any]) -> Iterator[None]:
+    """Temporarily replace attributes of a module."""
+
+    originals = {name: getattr(module, name) for name in replacements}
+
+    for name, replacement in replacements.items():
+        setattr(module, name, replacement)
+
+    try:
+        yield
+    finally:
+        for name, original in originals.items():
+            setattr(module, name, original)
+
+
+def run_day(day: int, options: RunOptions = RunOptions()) -> DayResult:
+    """Run a day's solution and record how long it spends parsing and solving."""
+
+    try:
+        module = import_day(day)
+    except Exception as error:
+        return DayResult(day, "error", error=f"{type(error).__name__}: {error}")
+
+    readers = get_readers(module)
+    if options.cache:
+        readers |= get_cached_readers(module)
+
+    profiler = None
+    if options.memory_profile or options.memory_budget_bytes is not None:
+        profiler = MemoryProfiler(options.memory_budget_bytes)
+        readers = {name: profiler.wrap(reader) for name, reader in readers.items()}
+
+    timer = PhaseTimer()
+    replacements = {name: timer.wrap(reader) for name, reader in readers.items()}
+
+    if options.memoize:
+        replacements |= get_memoized_functions(module)
+
+    stats = {}
+    if options.instrument:
+        instrumented_functions, stats = get_instrumented_functions(module)
+        replacements |= instrumented_functions
+
+    status = "ok"
+    error_message = None
+
+    if profiler:
+        profiler.start()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with patched(module, replacements), redirect_stdout(io.StringIO()):
+            module.main()
+    except KeyboardInterrupt:
+        # NOTE: The memory profiler interrupts the main thread when the budget is exceeded.
+        if not (profiler and profiler.budget_exceeded):
+            raise
+        status = "memory_budget_exceeded"
+        error_message = profiler.describe_budget_overrun()
+    except Exception as error:
+        status = "error"
+        error_message = f"{type(error).__name__}: {error}"
+    wall_time = time.perf_counter() - wall_start
+    cpu_time = time.process_time() - cpu_start
+
+    memory = None
+    if profiler:
+        profiler.stop()
+        memory = profiler.to_report()
+
+    instrumentation = None
+    if options.instrument:
+        instrumentation = {name: function_stats.to_report() for name, function_stats in stats.items()}
+
+    return DayResult(
+        day,
+        status,
+        parse_wall_time=timer.wall_time,
+        solve_wall_time=wall_time - timer.wall_time,
+        parse_cpu_time=timer.cpu_time,
+        solve_cpu_time=cpu_time - timer.cpu_time,
+        peak_rss_kb=resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        error=error_message,
+        instrumentation=instrumentation,
+        memory=memory,
+    )
+
+
+def run_days(days: list[int], jobs: int = 1, options: RunOptions = RunOptions()) -> list[DayResult]:
+    """Run several days' solutions on a pool of processes."""
+
+    # NOTE: Each worker runs a single day so that peak memory is measured per day.
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        mp_context=get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as executor:
+        return list(executor.map(partial(run_day, options=options), days))
+
+
+def write_results_json(results: list[DayResult], total_wall_time: float, file: TextIO) -> None:
+    """Write the results of a run as JSON."""
+
+    report = {
+        "total_wall_time": total_wall_time,
+        "days": [asdict(result) for result in results],
+    }
+    json.dump(report, file, indent=2)
+    file.write("\n")
+
+
+def write_results_csv(results: list[DayResult], file: TextIO) -> None:
+    """Write the results of a run as CSV."""
+
+    # NOTE: Nested reports don't fit in a table, so they are left out of CSV output.
+    fieldnames = [
+        field.name
+        for field in fields(DayResult)
+        if field.name not in ("instrumentation", "memory")
+    ]
+
+    writer = csv.DictWriter(file, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    writer.writerows(asdict(result) for result in results)
@@ -0,0 +1,299 @@
+"""
+Advent of Code 2015
+A long-lived local server that keeps the daily solutions and their inputs warm.
+
+Requests and responses are single lines of JSON, e.g. `{"day": 2}`.
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import time
+from asyncio import StreamReader, StreamWriter
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from functools import wraps
+from importlib import reload
+from multiprocessing import get_context
+from os import path
+from types import ModuleType
+from typing import Any, Optional
+
+from aoc2015 import REPO_ROOT, import_day
+from aoc2015.runner import discover_days, get_readers, patched
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 2015
+DEFAULT_MAX_PENDING = 64
+
+# Identifies the state of a day's source and inputs, so stale answers are never served.
+Fingerprint = tuple[tuple[str, int, int], ...]
+
+# NOTE: These live in each worker process, which keeps them warm between requests.
+WORKER_READERS: dict[int, dict[str, Callable[..., Any]]] = {}
+WORKER_FINGERPRINTS: dict[int, Fingerprint] = {}
+
+
+def fingerprint_day(day: int) -> Fingerprint:
+    """Describe the files of a day's solution by their names, sizes and modification times."""
+
+    directory = path.join(REPO_ROOT, f"day{day}")
+
+    return tuple(
+        (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+        for entry in sorted(os.scandir(directory), key=lambda entry: entry.name)
+        if entry.is_file()
+    )
+
+
+def keep_parsed(reader: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap a reader so that each input file is only parsed again once it changes."""
+
+    parsed = {}
+
+    @wraps(reader)
+    def warm_reader(file_path: str) -> Any:
+        stat = os.stat(file_path)
+        key = (file_path, stat.st_mtime_ns, stat.st_size)
+        if key not in parsed:
+            parsed.clear()
+            parsed[key] = reader(file_path)
+        return parsed[key]
+
+    return warm_reader
+
+
+def load_day(day: int, fingerprint: Fingerprint) -> ModuleType:
+    """Import a day's solution in a worker, reloading it if its files have changed."""
+
+    module = import_day(day)
+
+    if WORKER_FINGERPRINTS.get(day) != fingerprint:
+        if day in WORKER_FINGERPRINTS:
+            module = reload(module)
+
+        WORKER_READERS[day] = {
+            name: keep_parsed(reader) for name, reader in get_readers(module).items()
+        }
+        WORKER_FINGERPRINTS[day] = fingerprint
+
+    return module
+
+
+def preload_days() -> None:
+    """Import every day's solution in a worker before any request arrives.
+
+    A day that fails to import is reported and skipped here; the first request for it
+    imports it again and answers with the error.
+    """
+
+    for day in discover_days():
+        try:
+            load_day(day, fingerprint_day(day))
+        except Exception as error:
+            print(f"Could not preload day {day}: {type(error).__name__}: {error}", file=sys.stderr)
+
+
+def solve_day(day: int, fingerprint: Fingerprint) -> str:
+    """Run a day's solution in a worker and return what it printed.
+
+    The fingerprint is the one the server saw, so that a worker never answers for a
+    changed day with the code or inputs it loaded earlier.
+    """
+
+    module = load_day(day, fingerprint)
+    output = io.StringIO()
+
+    with patched(module, WORKER_READERS.get(day, {})), redirect_stdout(output):
+        module.main()
+
+    return output.getvalue()
+
+
+class SolveServer:
+    """Answers requests for the daily solutions using a pool of warm workers.
+
+    Answers are kept until a day's files change, and identical requests that arrive
+    while a day is being solved share a single solve. At most `max_pending` solves are
+    queued for the workers at once, and further requests wait for room.
+    """
+
+    def __init__(self, jobs: int, max_pending: int = DEFAULT_MAX_PENDING) -> None:
+        """Initialize the server with a pool of worker processes."""
+
+        self.jobs = jobs
+        self.executor = self.start_workers()
+        self.pending = asyncio.Semaphore(max_pending)
+        self.answers: dict[tuple[int, Fingerprint], str] = {}
+        self.in_flight: dict[tuple[int, Fingerprint], asyncio.Future] = {}
+        self.available_days = set(discover_days())
+
+    def start_workers(self) -> ProcessPoolExecutor:
+        """Start a pool of worker processes."""
+
+        return ProcessPoolExecutor(
+            max_workers=self.jobs,
+            mp_context=get_context("spawn"),
+            initializer=preload_days,
+        )
+
+    def replace_workers(self, broken_executor: ProcessPoolExecutor) -> None:
+        """Replace a pool that lost a worker, unless another request already has."""
+
+        if self.executor is broken_executor:
+            self.executor = self.start_workers()
+            broken_executor.shutdown(wait=False, cancel_futures=True)
+
+    async def solve(self, day: int) -> tuple[str, bool]:
+        """Solve a day, returning its output and whether it was already known."""
+
+        fingerprint = fingerprint_day(day)
+        key = (day, fingerprint)
+
+        if key in self.answers:
+            return self.answers[key], True
+
+        if key in self.in_flight:
+            return await asyncio.shield(self.in_flight[key]), True
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[key] = future
+        try:
+            async with self.pending:
+                executor = self.executor
+                try:
+                    output = await asyncio.get_running_loop().run_in_executor(
+                        executor, solve_day, day, fingerprint,
+                    )
+                except BrokenProcessPool:
+                    # NOTE: A pool that lost a worker refuses all further work, so it is
+                    # replaced for later requests before this one reports the failure.
+                    self.replace_workers(executor)
+                    raise
+            self.store_answer(key, output)
+            future.set_result(output)
+            return output, False
+        except Exception as error:
+            future.set_exception(error)
+            # NOTE: Mark the exception as retrieved in case no one else was waiting on it.
+            future.exception()
+            raise
+        finally:
+            del self.in_flight[key]
+
+    def store_answer(self, key: tuple[int, Fingerprint], output: str) -> None:
+        """Keep a day's answer, dropping any answers for earlier versions of that day."""
+
+        day, _ = key
+        for stale_key in [stored_key for stored_key in self.answers if stored_key[0] == day]:
+            del self.answers[stale_key]
+
+        self.answers[key] = output
+
+    async def handle_request(self, request: Any) -> dict[str, Any]:
+        """Answer a single decoded request."""
+
+        if not isinstance(request, dict):
+            return {"status": "error", "error": "Invalid request: expected a JSON object."}
+
+        day = request.get("day")
+        # NOTE: Booleans are ints in Python, but `true` is not a day.
+        if not isinstance(day, int) or isinstance(day, bool):
+            message = f"Invalid request: day must be an integer, got {day!r}."
+            return {"status": "error", "error": message}
+
+        if day not in self.available_days:
+            return {"status": "error", "error": f"No solution for day {day}."}
+
+        start = time.perf_counter()
+        try:
+            output, cached = await self.solve(day)
+        except Exception as error:
+            return {"day": day, "status": "error", "error": f"{type(error).__name__}: {error}"}
+
+        return {
+            "day": day,
+            "status": "ok",
+            "output": output,
+            "cached": cached,
+            "elapsed": time.perf_counter() - start,
+        }
+
+    async def handle_connection(self, reader: StreamReader, writer: StreamWriter) -> None:
+        """Answer the requests of a single client, one line at a time."""
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as error:
+                    response = {"status": "error", "error": f"Invalid request: {error}"}
+                else:
+                    response = await self.handle_request(request)
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                # NOTE: Waiting for the client to drain its responses keeps a slow reader
+                # from piling up output on the server.
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def close(self) -> None:
+        """Shut down the worker processes."""
+
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(
+    jobs: int,
+    socket_path: Optional[str] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> None:
+    """Serve requests on a Unix socket, or on a local TCP port if none is given."""
+
+    solve_server = SolveServer(jobs, max_pending)
+
+    try:
+        if socket_path:
+            server = await asyncio.start_unix_server(solve_server.handle_connection, socket_path)
+        else:
+            server = await asyncio.start_server(solve_server.handle_connection, host, port)
+
+        async with server:
+            await server.serve_forever()
+    finally:
+        solve_server.close()
+
+
+async def query(
+    days: list[int],
+    socket_path: Optional[str] = None,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+) -> list[dict[str, Any]]:
+    """Ask a running server to solve several days."""
+
+    if socket_path:
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+
+    responses = []
+    try:
+        for day in days:
+            writer.write(json.dumps({"day": day}).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+    return responses
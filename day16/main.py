@@ -4,22 +4,37 @@ Aunt Sue
 https://adventofcode.com/2015/day/16
 """
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 import re
-from dataclasses import dataclass
-from operator import eq, gt, lt
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter, eq, gt, lt
 from os import path
-from typing import Optional
+from typing import NamedTuple, Optional
+
+import numpy as np
 
 
 INPUT_FILE = "input.txt"
 
 SUE_REGEX = re.compile(r"Sue (\d+): (.+)")
+PROPERTY_REGEX = re.compile(r"(\w+): (\d+)")
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# NOTE: The tile size bounds the size of the intermediate (targets x candidates) arrays
+# built while matching in batches.
+TILE_SIZE = 1024
+
+# NOTE: Selectivity is measured on a prefix of the candidates rather than all of them,
+# since the ordering only needs to be roughly right to reject most candidates early.
+SELECTIVITY_SAMPLE_SIZE = 256
+COMPILED_MATCHER_CACHE_SIZE = 1024
 
 # NOTE: The use of optional values in the Sue class indicates that the property is not known,
 # not that the value is zero. In these cases, the property should be ignored when comparing Sues.
 
-@dataclass
+@dataclass(slots=True)
 class Sue:
     number: int
     children: Optional[int] = None
@@ -33,9 +48,16 @@ class Sue:
     cars: Optional[int] = None
     perfumes: Optional[int] = None
 
+PROPERTY_NAMES = tuple(field.name for field in fields(Sue) if field.name != "number")
+
+SueProperties = tuple[Optional[int], ...]
+
+get_sue_properties: Callable[[Sue], SueProperties] = attrgetter(*PROPERTY_NAMES)
+
 Comparator = Callable[[Optional[int], Optional[int]], bool]
+SueMatcher = Callable[[Sue], bool]
 
-@dataclass
+@dataclass(frozen=True)
 class ComparisonRules:
     children: Comparator
     cats: Comparator
@@ -75,6 +97,17 @@ COMPARE_WITH_RANGES = ComparisonRules(
 TARGET_SUE = Sue(0, children=3, cats=7, samoyeds=2, pomeranians=3, akitas=0, vizslas=0, goldfish=5, trees=3, cars=2, perfumes=1)
 
 
+class SueMatrix(NamedTuple):
+    """A columnar representation of a list of Aunt Sues.
+
+    Unknown properties are stored as zero in `values` and marked as False in `known`.
+    """
+
+    numbers: np.ndarray
+    values: np.ndarray
+    known: np.ndarray
+
+
 def read_sues(file_path: str) -> list[Sue]:
     """Read information about each Sue from a file."""
 
@@ -100,22 +133,138 @@ def parse_sue(line: str) -> Sue:
     return sue
 
 
+def read_lines_in_blocks(file_path: str, block_size: int = READ_BLOCK_SIZE) -> Iterator[str]:
+    """Lazily read the lines of a file, loading it one block at a time."""
+
+    with open(file_path, encoding="utf-8") as file:
+        remainder = ""
+
+        while block := file.read(block_size):
+            lines = (remainder + block).split("\n")
+            remainder = lines.pop()
+            yield from lines
+
+        if remainder:
+            yield remainder
+
+
+def raw_properties_match_target(raw_properties: str, target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE) -> bool:
+    """Determine if the unparsed properties of an Aunt Sue match the target's.
+
+    Properties are parsed one at a time, so a conflict stops parsing the rest of the line.
+    """
+
+    for property_match in PROPERTY_REGEX.finditer(raw_properties):
+        key, value = property_match.groups()
+
+        target_property_value = getattr(target, key)
+        if target_property_value is None:
+            continue
+
+        comparator = getattr(comparison_rules, key)
+        if comparator(int(value), target_property_value) is False:
+            return False
+
+    return True
+
+
+def iter_matching_sues_in_file(file_path: str, target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE) -> Iterator[Sue]:
+    """Stream every Aunt Sue in a file whose properties match the target's.
+
+    Only matching Sues are fully parsed. The file is read no further than the consumer asks.
+    """
+
+    for line in read_lines_in_blocks(file_path):
+        line = line.strip()
+        if not line:
+            continue
+
+        pattern_match = re.match(SUE_REGEX, line)
+        if not pattern_match:
+            raise ValueError(f"Invalid Sue data: {line}")
+
+        if raw_properties_match_target(pattern_match.group(2), target, comparison_rules):
+            yield parse_sue(line)
+
+
+def find_matching_sue_in_file(file_path: str, target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE) -> Optional[Sue]:
+    """Find the first Aunt Sue in a file whose properties match the target's.
+
+    Reading stops as soon as a match is found.
+    """
+
+    return next(iter_matching_sues_in_file(file_path, target, comparison_rules), None)
+
+
 def find_matching_sue(candidates: list[Sue], target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE) -> Optional[Sue]:
     """Find the Aunt Sue whose properties match the target's."""
 
+    property_order = measure_selectivity(candidates[:SELECTIVITY_SAMPLE_SIZE], target, comparison_rules)
+    matcher = compile_matcher(comparison_rules, get_sue_properties(target), property_order)
+
     for candidate in candidates:
-        if sue_matches_target(candidate, target, comparison_rules):
+        if matcher(candidate):
             return candidate
 
     return None
 
 
+def measure_selectivity(candidates: list[Sue], target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE) -> tuple[str, ...]:
+    """Order the target's known properties by how many candidates each one rejects.
+
+    The most selective property comes first.
+    """
+
+    rejections = {}
+
+    for column, key in enumerate(PROPERTY_NAMES):
+        target_property_value = getattr(target, key)
+        if target_property_value is None:
+            continue
+
+        comparator = getattr(comparison_rules, key)
+        values = (get_sue_properties(candidate)[column] for candidate in candidates)
+        rejections[key] = sum(
+            1
+            for value in values
+            if value is not None and not comparator(value, target_property_value)
+        )
+
+    return tuple(sorted(rejections, key=rejections.__getitem__, reverse=True))
+
+
+@lru_cache(maxsize=COMPILED_MATCHER_CACHE_SIZE)
+def compile_matcher(comparison_rules: ComparisonRules, target_properties: SueProperties, property_order: tuple[str, ...] = PROPERTY_NAMES) -> SueMatcher:
+    """Build a matcher that checks a candidate against the target's properties.
+
+    The target's properties are given in `PROPERTY_NAMES` order. Checks run in
+    `property_order`, so the most selective properties should come first.
+    """
+
+    checks = []
+    for key in property_order:
+        column = PROPERTY_NAMES.index(key)
+        target_property_value = target_properties[column]
+        if target_property_value is not None:
+            checks.append((column, getattr(comparison_rules, key), target_property_value))
+
+    def matcher(candidate: Sue) -> bool:
+        values = get_sue_properties(candidate)
+
+        for column, comparator, target_property_value in checks:
+            value = values[column]
+            if value is not None and not comparator(value, target_property_value):
+                return False
+
+        return True
+
+    return matcher
+
+
 def sue_matches_target(candidate: Sue, target: Sue, comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE,) -> bool:
     """Determine if an Aunt Sue's properties match the target's."""
 
-    properties = {key: value for key, value in candidate.__dict__.items() if key != "number"}
-
-    for key, value in properties.items():
+    for key, value in zip(PROPERTY_NAMES, get_sue_properties(candidate)):
         if value is None:
             continue
 
@@ -130,6 +279,73 @@ def sue_matches_target(candidate: Sue, target: Sue, comparison_rules: Comparison
     return True
 
 
+def build_sue_matrix(sues: list[Sue]) -> SueMatrix:
+    """Build a columnar representation of a list of Aunt Sues."""
+
+    numbers = np.array([sue.number for sue in sues], dtype=np.int64)
+    values = np.zeros((len(sues), len(PROPERTY_NAMES)), dtype=np.int64)
+    known = np.zeros((len(sues), len(PROPERTY_NAMES)), dtype=bool)
+
+    for row, sue in enumerate(sues):
+        for column, key in enumerate(PROPERTY_NAMES):
+            value = getattr(sue, key)
+            if value is not None:
+                values[row, column] = value
+                known[row, column] = True
+
+    return SueMatrix(numbers, values, known)
+
+
+def find_matching_sues_batch(
+    candidates: SueMatrix,
+    target_values: np.ndarray,
+    comparison_rules: ComparisonRules = COMPARE_BY_EQUIVALENCE,
+    target_known: Optional[np.ndarray] = None,
+    tile_size: int = TILE_SIZE,
+) -> list[np.ndarray]:
+    """Find the numbers of every Aunt Sue whose properties match each target's.
+
+    The targets are given as a (targets x properties) matrix in the same column order as
+    a `SueMatrix`. Unknown target properties can be masked out with `target_known`.
+    """
+
+    if target_known is None:
+        target_known = np.ones(target_values.shape, dtype=bool)
+
+    comparators = [getattr(comparison_rules, key) for key in PROPERTY_NAMES]
+    matches = [[] for _ in range(len(target_values))]
+
+    for target_start in range(0, len(target_values), tile_size):
+        target_end = target_start + tile_size
+        target_tile = target_values[target_start:target_end, np.newaxis, :]
+        target_unknown_tile = ~target_known[target_start:target_end, np.newaxis, :]
+
+        for candidate_start in range(0, len(candidates.numbers), tile_size):
+            candidate_end = candidate_start + tile_size
+            candidate_tile = candidates.values[np.newaxis, candidate_start:candidate_end, :]
+            candidate_unknown_tile = ~candidates.known[np.newaxis, candidate_start:candidate_end, :]
+
+            tile_matches = np.ones(
+                (target_tile.shape[0], candidate_tile.shape[1]), dtype=bool,
+            )
+            for column, comparator in enumerate(comparators):
+                tile_matches &= (
+                    comparator(candidate_tile[..., column], target_tile[..., column])
+                    | candidate_unknown_tile[..., column]
+                    | target_unknown_tile[..., column]
+                )
+
+            numbers = candidates.numbers[candidate_start:candidate_end]
+            for offset, row in enumerate(tile_matches):
+                if row.any():
+                    matches[target_start + offset].append(numbers[row])
+
+    return [
+        np.concatenate(target_matches) if target_matches else np.empty(0, dtype=np.int64)
+        for target_matches in matches
+    ]
+
+
 def main() -> None:
     """Read information about each Aunt Sue and process it."""
 
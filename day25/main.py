@@ -5,10 +5,17 @@ https://adventofcode.com/2015/day/25
 """
 
 import re
+from collections.abc import Iterator
 from os import path
 
+import numpy as np
+
 INPUT_FILE = "input.txt"
 
+FIRST_CODE = 20151125
+MULTIPLIER = 252533
+MODULUS = 33554393
+
 # NOTE: The double space in the regex is an intentional part of the puzzle input.
 CODE_REGEX = re.compile(
     r"To continue, please consult the code grid in the manual.  "
@@ -31,11 +38,61 @@ def read_code_position(file_path: str) -> tuple[int, int]:
 def get_code_number(row: int, column: int) -> int:
     """Calculate the number in which the code is generated."""
 
+    # NOTE: Codes are generated along diagonals, so every code on earlier diagonals comes
+    # first. The diagonal a position lies on is numbered by row + column - 1.
+    diagonal = row + column - 1
+    return diagonal * (diagonal - 1) // 2 + column
+
+
+def get_code_by_number(code_number: int) -> int:
+    """Calculate the nth code to be generated."""
+
+    return FIRST_CODE * pow(MULTIPLIER, code_number - 1, MODULUS) % MODULUS
+
 
 def get_code_at_position(row: int, column: int) -> int:
     """Calculate the code at a given position in the grid."""
 
-    pass
+    return get_code_by_number(get_code_number(row, column))
+
+
+def get_codes_at_positions(rows: np.ndarray, columns: np.ndarray) -> np.ndarray:
+    """Calculate the codes at many positions in the grid at once."""
+
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = np.asarray(columns, dtype=np.int64)
+
+    diagonals = rows + columns - 1
+    exponents = diagonals * (diagonals - 1) // 2 + columns - 1
+
+    # NOTE: The modulus is below 2**26, so every product fits comfortably in 64 bits.
+    codes = np.full(exponents.shape, FIRST_CODE, dtype=np.int64)
+    power = np.full(exponents.shape, MULTIPLIER, dtype=np.int64)
+
+    while np.any(exponents):
+        odd = (exponents & 1).astype(bool)
+        codes[odd] = codes[odd] * power[odd] % MODULUS
+        power = power * power % MODULUS
+        exponents >>= 1
+
+    return codes
+
+
+def generate_codes_by_diagonal(
+    first_diagonal: int,
+    last_diagonal: int,
+) -> Iterator[tuple[int, int, int]]:
+    """Generate the row, column and code of every position on a range of diagonals.
+
+    Generation jumps directly to the start of the first diagonal.
+    """
+
+    code = get_code_at_position(first_diagonal, 1)
+
+    for diagonal in range(first_diagonal, last_diagonal + 1):
+        for column in range(1, diagonal + 1):
+            yield diagonal - column + 1, column, code
+            code = code * MULTIPLIER % MODULUS
 
 
 def main() -> None:
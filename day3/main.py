@@ -8,8 +8,15 @@ from enum import Enum
 from os import path
 from typing import NamedTuple
 
+import numpy as np
+
 INPUT_FILE = "input.txt"
 
+# NOTE: Coordinates are offset to be non-negative so that both fit in the halves of a
+# single unsigned 64-bit key.
+COORDINATE_OFFSET = 1 << 31
+COORDINATE_MASK = (1 << 32) - 1
+
 
 class Position(NamedTuple):
     """A position on the grid."""
@@ -27,6 +34,83 @@ class Direction(Enum):
     LEFT = "<"
 
 
+STEPS = {
+    Direction.UP: (0, 1),
+    Direction.DOWN: (0, -1),
+    Direction.RIGHT: (1, 0),
+    Direction.LEFT: (-1, 0),
+}
+
+
+class VisitMap:
+    """Counts how many times each agent visited each house.
+
+    Houses are stored as sorted, packed coordinate keys alongside a (houses x agents)
+    table of visit counts, rather than as a set of positions.
+    """
+
+    def __init__(self, keys: np.ndarray, counts: np.ndarray) -> None:
+        """Initialize the map from sorted house keys and their visit counts."""
+
+        self.keys = keys
+        self.counts = counts
+
+    def __len__(self) -> int:
+        """Count the houses that were visited at least once."""
+
+        return len(self.keys)
+
+    def positions(self) -> tuple[np.ndarray, np.ndarray]:
+        """Unpack the x and y coordinates of every house."""
+
+        xs = (self.keys >> np.uint64(32)).astype(np.int64) - COORDINATE_OFFSET
+        ys = (self.keys & np.uint64(COORDINATE_MASK)).astype(np.int64) - COORDINATE_OFFSET
+
+        return xs, ys
+
+    def total_visits(self) -> np.ndarray:
+        """Count the visits to each house across all agents."""
+
+        return self.counts.sum(axis=1)
+
+    def top_visited(self, k: int) -> list[tuple[Position, int]]:
+        """Find the k most visited houses and how many times each was visited."""
+
+        totals = self.total_visits()
+        k = min(k, len(totals))
+        if k == 0:
+            return []
+
+        top = np.argpartition(-totals, k - 1)[:k]
+        top = top[np.argsort(-totals[top], kind="stable")]
+        xs, ys = self.positions()
+
+        return [(Position(int(xs[i]), int(ys[i])), int(totals[i])) for i in top]
+
+    def visit_histogram(self) -> dict[int, int]:
+        """Count how many houses were visited each number of times."""
+
+        visits, houses = np.unique(self.total_visits(), return_counts=True)
+        return dict(zip(visits.tolist(), houses.tolist()))
+
+    def bounding_box(self) -> tuple[Position, Position]:
+        """Find the corners of the smallest box containing every visited house."""
+
+        xs, ys = self.positions()
+        return Position(int(xs.min()), int(ys.min())), Position(int(xs.max()), int(ys.max()))
+
+    def heatmap(self) -> np.ndarray:
+        """Build a dense grid of total visits, indexed by [y - min y, x - min x]."""
+
+        xs, ys = self.positions()
+        (min_x, min_y), (max_x, max_y) = self.bounding_box()
+
+        grid = np.zeros((max_y - min_y + 1, max_x - min_x + 1), dtype=self.counts.dtype)
+        grid[ys - min_y, xs - min_x] = self.total_visits()
+
+        return grid
+
+
 def read_directions(file_path: str) -> list[Direction]:
     """Read directions from the input file."""
 
@@ -76,6 +160,37 @@ def deliver_gifts(directions: list[Direction], agent_count: int = 1) -> int:
     return len(visited)
 
 
+def pack_positions(xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+    """Pack coordinates into single unsigned 64-bit keys."""
+
+    packed_xs = (xs + COORDINATE_OFFSET).astype(np.uint64) << np.uint64(32)
+    packed_ys = (ys + COORDINATE_OFFSET).astype(np.uint64)
+
+    return packed_xs | packed_ys
+
+
+def map_visits(directions: list[Direction], agent_count: int = 1) -> VisitMap:
+    """Deliver gifts according to the given directions, counting each agent's visits."""
+
+    steps = np.array([STEPS[direction] for direction in directions], dtype=np.int64)
+    steps = steps.reshape(-1, 2)
+    keys = []
+    agents = []
+
+    for agent in range(agent_count):
+        # NOTE: Every agent delivers a gift to the starting house before moving.
+        moves = np.cumsum(steps[agent::agent_count], axis=0)
+        positions = np.vstack([np.zeros((1, 2), dtype=np.int64), moves])
+        keys.append(pack_positions(positions[:, 0], positions[:, 1]))
+        agents.append(np.full(len(positions), agent))
+
+    unique_keys, houses = np.unique(np.concatenate(keys), return_inverse=True)
+    counts = np.zeros((len(unique_keys), agent_count), dtype=np.uint32)
+    np.add.at(counts, (houses, np.concatenate(agents)), 1)
+
+    return VisitMap(unique_keys, counts)
+
+
 def main() -> None:
     """Execute the program."""
 
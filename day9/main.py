@@ -4,13 +4,28 @@ All in a Single Night
 https://adventofcode.com/2015/day/9
 """
 
+import random
 import re
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from math import inf
 from os import path
-from typing import NamedTuple
+from typing import NamedTuple, Optional
+
+import numpy as np
 
 INPUT_FILE = "input.txt"
 TEST_FILE = "test.txt"
 
+DEFAULT_START_COUNT = 8
+DEFAULT_TIME_BUDGET = 10.0
+OR_OPT_SEGMENT_LENGTHS = (1, 2, 3)
+
+# NOTE: Moves must improve a tour by more than this to be applied, which keeps floating
+# point noise from causing endless swaps between equivalent tours.
+IMPROVEMENT_TOLERANCE = 1e-9
+
 ROUTE_REGEX = re.compile(r"(\w+) to (\w+) = (\d+)")
 
 
@@ -41,27 +56,464 @@ def parse_route(line: str) -> Route:
     return Route(city1, city2, int(distance))
 
 
-def get_shortest_distance_to_visit_all_cities(routes: list[Route]) -> int:
+class TourResult(NamedTuple):
+    """A route found heuristically, along with how far from optimal it might be.
+
+    For shortest routes, the bound is a lower bound on the optimal distance. For longest
+    routes, it is an upper bound. The gap is the relative difference between the two.
+    """
+
+    cities: list[str]
+    distance: Optional[int]
+    bound: float
+    gap: float
+
+
+class RouteOptimizer:
+    """Finds the shortest and longest routes that visit every city exactly once.
+
+    For every set of cities and every city in it, the optimizer keeps the shortest and
+    longest distances of a path that visits exactly that set and ends at that city.
+    Sets are stored as bitmasks over the cities' indices. These tables are kept between
+    edits, so an edit only recomputes the sets it can affect.
+    """
+
+    def __init__(self, routes: list[Route]) -> None:
+        """Initialize the optimizer and solve for the given routes."""
+
+        self.cities: list[str] = []
+        self.distances: list[list[Optional[int]]] = []
+        # NOTE: Both tables start with a row for the empty set of cities.
+        self.shortest: list[list[float]] = [[]]
+        self.longest: list[list[float]] = [[]]
+
+        for route in routes:
+            for city in (route.city1, route.city2):
+                if city not in self.cities:
+                    self.cities.append(city)
+                    for row in self.distances:
+                        row.append(None)
+                    self.distances.append([None] * len(self.cities))
+
+            self.set_distance(route.city1, route.city2, route.distance)
+
+        self.extend_tables(0)
+
+    def set_distance(self, city1: str, city2: str, distance: Optional[int]) -> None:
+        """Record the distance between two cities without updating the tables."""
+
+        index1 = self.cities.index(city1)
+        index2 = self.cities.index(city2)
+        self.distances[index1][index2] = distance
+        self.distances[index2][index1] = distance
+
+    def compute_set(self, mask: int) -> None:
+        """Compute the best paths through a set of cities from those through its subsets."""
+
+        members = [index for index in range(len(self.cities)) if mask & (1 << index)]
+        shortest_row = self.shortest[mask]
+        longest_row = self.longest[mask]
+
+        for end in members:
+            previous_mask = mask ^ (1 << end)
+            if not previous_mask:
+                shortest_row[end] = 0
+                longest_row[end] = 0
+                continue
+
+            shortest = inf
+            longest = -inf
+            previous_shortest = self.shortest[previous_mask]
+            previous_longest = self.longest[previous_mask]
+            distances_to_end = self.distances[end]
+
+            for previous in members:
+                distance = distances_to_end[previous]
+                if previous == end or distance is None:
+                    continue
+
+                shortest = min(shortest, previous_shortest[previous] + distance)
+                longest = max(longest, previous_longest[previous] + distance)
+
+            shortest_row[end] = shortest
+            longest_row[end] = longest
+
+    def extend_tables(self, first_new_city: int) -> None:
+        """Compute the tables for every set that includes a city from `first_new_city` on."""
+
+        city_count = len(self.cities)
+        existing_sets = 1 << first_new_city
+
+        for _ in range(existing_sets, 1 << city_count):
+            self.shortest.append([inf] * city_count)
+            self.longest.append([-inf] * city_count)
+
+        for row in self.shortest[:existing_sets]:
+            row.extend([inf] * (city_count - len(row)))
+        for row in self.longest[:existing_sets]:
+            row.extend([-inf] * (city_count - len(row)))
+
+        for mask in range(existing_sets, 1 << city_count):
+            self.compute_set(mask)
+
+    def update_distance(self, city1: str, city2: str, distance: Optional[int]) -> None:
+        """Change the distance between two cities, or remove the route with None.
+
+        Only sets containing both cities can use the route, so only they are recomputed.
+        """
+
+        self.set_distance(city1, city2, distance)
+
+        both = (1 << self.cities.index(city1)) | (1 << self.cities.index(city2))
+        for mask in range(both, 1 << len(self.cities)):
+            if mask & both == both:
+                self.compute_set(mask)
+
+    def add_city(self, city: str, distances: dict[str, int]) -> None:
+        """Add a city along with its distances to existing cities.
+
+        Sets without the new city are unaffected, so only sets including it are computed.
+        """
+
+        if city in self.cities:
+            raise ValueError(f"City already exists: {city}")
+
+        self.cities.append(city)
+        for row in self.distances:
+            row.append(None)
+        self.distances.append([None] * len(self.cities))
+
+        for other_city, distance in distances.items():
+            self.set_distance(city, other_city, distance)
+
+        self.extend_tables(len(self.cities) - 1)
+
+    def remove_city(self, city: str) -> None:
+        """Remove a city and every route to it.
+
+        Sets without the removed city are kept as they are, so nothing is recomputed.
+        """
+
+        removed = self.cities.index(city)
+
+        def keep_others(row: list) -> list:
+            return row[:removed] + row[removed + 1 :]
+
+        shortest = []
+        longest = []
+        for mask in range(1 << len(self.cities)):
+            if mask & (1 << removed):
+                continue
+
+            # NOTE: Sets are visited in increasing order, so each one is appended at the
+            # index it has once the removed city's bit is dropped.
+            shortest.append(keep_others(self.shortest[mask]))
+            longest.append(keep_others(self.longest[mask]))
+
+        self.cities.pop(removed)
+        self.distances = [keep_others(row) for row in keep_others(self.distances)]
+        self.shortest = shortest
+        self.longest = longest
+
+    def best_distance(self, table: list[list[float]], choose: Callable[..., float]) -> Optional[int]:
+        """Choose the best distance among paths that visit every city."""
+
+        if not self.cities:
+            return 0
+
+        distance = choose(table[(1 << len(self.cities)) - 1])
+        return None if distance in (inf, -inf) else int(distance)
+
+    def shortest_distance(self) -> Optional[int]:
+        """Determine the shortest distance to visit all cities, if any route exists."""
+
+        return self.best_distance(self.shortest, min)
+
+    def longest_distance(self) -> Optional[int]:
+        """Determine the longest distance to visit all cities, if any route exists."""
+
+        return self.best_distance(self.longest, max)
+
+
+def get_shortest_distance_to_visit_all_cities(routes: list[Route]) -> Optional[int]:
     """Determine the shortest distance required to visit all cities.
     
     Calculations can start and end at any city so long as each city is only visited once.
     """
 
-    pass
+    return RouteOptimizer(routes).shortest_distance()
+
+
+def get_longest_distance_to_visit_all_cities(routes: list[Route]) -> Optional[int]:
+    """Determine the longest distance required to visit all cities.
+
+    Calculations can start and end at any city so long as each city is only visited once.
+    """
+
+    return RouteOptimizer(routes).longest_distance()
+
+
+def build_distance_matrix(routes: list[Route]) -> tuple[list[str], np.ndarray]:
+    """Build a matrix of the distances between cities, with infinity for missing routes."""
+
+    cities = list(dict.fromkeys(city for route in routes for city in route[:2]))
+    indices = {city: index for index, city in enumerate(cities)}
+
+    distances = np.full((len(cities), len(cities)), np.inf)
+    np.fill_diagonal(distances, 0)
+
+    for city1, city2, distance in routes:
+        distances[indices[city1], indices[city2]] = distance
+        distances[indices[city2], indices[city1]] = distance
+
+    return cities, distances
+
+
+def build_tour_costs(distances: np.ndarray, longest: bool = False) -> np.ndarray:
+    """Build the costs of a closed tour whose best ordering is the best open path.
+
+    An extra city is added at the end whose routes cost nothing, so that the two routes
+    touching it mark where the open path starts and ends. Longest paths are found by
+    minimizing negated distances. Missing routes cost more than any complete path.
+    """
+
+    costs = -distances if longest else distances.copy()
+    missing = ~np.isfinite(distances)
+
+    known = np.abs(costs[~missing])
+    penalty = (known.max() + 1) * len(distances) if known.size else 1.0
+    costs[missing] = penalty
+
+    tour_costs = np.zeros((len(distances) + 1, len(distances) + 1))
+    tour_costs[:-1, :-1] = costs
+    np.fill_diagonal(tour_costs, 0)
+
+    return tour_costs
+
+
+def get_tour_cost(costs: np.ndarray, tour: np.ndarray) -> float:
+    """Calculate the cost of a closed tour."""
+
+    return float(costs[tour, np.roll(tour, -1)].sum())
+
+
+def construct_nearest_neighbour_tour(costs: np.ndarray, start: int) -> np.ndarray:
+    """Build a tour by repeatedly travelling to the cheapest unvisited city."""
+
+    city_count = len(costs)
+    tour = np.empty(city_count, dtype=np.int64)
+    visited = np.zeros(city_count, dtype=bool)
+
+    current = start
+    for position in range(city_count):
+        tour[position] = current
+        visited[current] = True
+        if position < city_count - 1:
+            current = int(np.argmin(np.where(visited, np.inf, costs[current])))
+
+    return tour
+
+
+def improve_with_two_opt(costs: np.ndarray, tour: np.ndarray, deadline: float) -> tuple[np.ndarray, bool]:
+    """Reverse segments of a tour while doing so makes it cheaper.
+
+    Returns the tour and whether any improvement was made.
+    """
+
+    city_count = len(tour)
+    improved = False
+    found_improvement = True
+
+    while found_improvement and time.time() < deadline:
+        found_improvement = False
+
+        for i in range(city_count - 2):
+            a, b = tour[i], tour[i + 1]
+            # NOTE: Reversing every city but the first is the same tour, so the last
+            # edge is only swapped with edges that don't touch the first city.
+            last = city_count - 1 if i == 0 else city_count
+            c = tour[i + 2 : last]
+            d = tour[(np.arange(i + 2, last) + 1) % city_count]
+            if len(c) == 0:
+                continue
+
+            deltas = costs[a, c] + costs[b, d] - costs[a, b] - costs[c, d]
+            best = int(np.argmin(deltas))
+
+            if deltas[best] < -IMPROVEMENT_TOLERANCE:
+                j = i + 2 + best
+                tour[i + 1 : j + 1] = tour[i + 1 : j + 1][::-1].copy()
+                found_improvement = improved = True
+
+    return tour, improved
+
+
+def improve_with_or_opt(costs: np.ndarray, tour: np.ndarray, deadline: float) -> tuple[np.ndarray, bool]:
+    """Move short segments of a tour elsewhere, possibly reversed, while doing so makes it cheaper.
+
+    Returns the tour and whether any improvement was made.
+    """
+
+    city_count = len(tour)
+    improved = False
+    found_improvement = True
+
+    while found_improvement and time.time() < deadline:
+        found_improvement = False
+
+        for length in OR_OPT_SEGMENT_LENGTHS:
+            if city_count < length + 3:
+                continue
+
+            for i in range(1, city_count - length + 1):
+                segment = tour[i : i + length]
+                first, last = segment[0], segment[-1]
+                previous = tour[i - 1]
+                following = tour[(i + length) % city_count]
+
+                removal_gain = (
+                    costs[previous, first] + costs[last, following] - costs[previous, following]
+                )
+
+                remaining = np.concatenate([tour[:i], tour[i + length :]])
+                u = remaining
+                v = np.roll(remaining, -1)
+                forward = costs[u, first] + costs[last, v] - costs[u, v]
+                backward = costs[u, last] + costs[first, v] - costs[u, v]
+                insertion_costs = np.minimum(forward, backward)
+                # NOTE: Inserting the segment back where it came from is not a move.
+                insertion_costs[i - 1] = np.inf
+
+                best = int(np.argmin(insertion_costs))
+                if insertion_costs[best] - removal_gain < -IMPROVEMENT_TOLERANCE:
+                    moved = segment if forward[best] <= backward[best] else segment[::-1]
+                    tour = np.concatenate([remaining[: best + 1], moved, remaining[best + 1 :]])
+                    found_improvement = improved = True
+
+    return tour, improved
+
+
+def search_tour(costs: np.ndarray, start: int, deadline: float) -> tuple[float, np.ndarray]:
+    """Build a tour from a starting city and improve it until no move helps or time runs out."""
+
+    tour = construct_nearest_neighbour_tour(costs, start)
+
+    improved = True
+    while improved and time.time() < deadline:
+        tour, two_opt_improved = improve_with_two_opt(costs, tour, deadline)
+        tour, or_opt_improved = improve_with_or_opt(costs, tour, deadline)
+        improved = two_opt_improved or or_opt_improved
+
+    return get_tour_cost(costs, tour), tour
+
+
+def tour_to_path(tour: np.ndarray) -> list[int]:
+    """Convert a tour through the extra city into an open path through the real ones."""
+
+    split = int(np.flatnonzero(tour == len(tour) - 1)[0])
+    return [int(city) for city in np.concatenate([tour[split + 1 :], tour[:split]])]
+
+
+def find_spanning_tree_weight(distances: np.ndarray, longest: bool = False) -> float:
+    """Find the weight of a minimum (or maximum) spanning tree of the cities.
+
+    Every open path is a spanning tree, so this bounds the best path's distance.
+    """
+
+    city_count = len(distances)
+    if city_count < 2:
+        return 0.0
+
+    weights = -distances if longest else distances
+    weights = np.where(np.isfinite(distances), weights, np.inf)
+
+    in_tree = np.zeros(city_count, dtype=bool)
+    in_tree[0] = True
+    cheapest = weights[0].copy()
+    total = 0.0
+
+    for _ in range(city_count - 1):
+        candidates = np.where(in_tree, np.inf, cheapest)
+        nearest = int(np.argmin(candidates))
+        total += candidates[nearest]
+        in_tree[nearest] = True
+        cheapest = np.minimum(cheapest, weights[nearest])
+
+    return -total if longest else total
+
+
+def measure_path(distances: np.ndarray, path_indices: list[int]) -> Optional[int]:
+    """Calculate the distance of an open path, if every route along it exists."""
+
+    distance = distances[path_indices[:-1], path_indices[1:]].sum()
+    return int(distance) if np.isfinite(distance) else None
+
+
+def find_route_heuristically(
+    routes: list[Route],
+    longest: bool = False,
+    start_count: int = DEFAULT_START_COUNT,
+    jobs: int = 1,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    seed: int = 0,
+) -> TourResult:
+    """Search for a short (or long) route visiting every city, for graphs too large to solve exactly.
+
+    Tours are built by nearest neighbour from several starting cities, then improved with
+    2-opt and Or-opt moves. Starts run on a pool of `jobs` processes and all stop
+    improving once `time_budget` seconds have passed.
+    """
+
+    cities, distances = build_distance_matrix(routes)
+    costs = build_tour_costs(distances, longest)
+
+    rng = random.Random(seed)
+    # NOTE: The extra city is always one of the starts, since from it nearest neighbour
+    # picks the best possible first city.
+    starts = [len(cities)] + rng.sample(range(len(cities)), min(start_count, len(cities)) - 1)
+    deadline = time.time() + time_budget
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            searches = list(
+                executor.map(
+                    search_tour,
+                    [costs] * len(starts),
+                    starts,
+                    [deadline] * len(starts),
+                ),
+            )
+    else:
+        searches = [search_tour(costs, start, deadline) for start in starts]
+
+    _, best_tour = min(searches, key=lambda search: search[0])
+    path_indices = tour_to_path(best_tour)
+    distance = measure_path(distances, path_indices)
+
+    bound = float(find_spanning_tree_weight(distances, longest))
+    if distance is None or bound in (inf, -inf):
+        gap = inf
+    else:
+        gap = abs(distance - bound) / bound if bound else 0.0
+
+    return TourResult([cities[index] for index in path_indices], distance, bound, gap)
 
 
 def main() -> None:
     """Read route data from a file and process it."""
 
-    input_file = TEST_FILE
+    input_file = INPUT_FILE
     file_path = path.join(path.dirname(__file__), input_file)
 
     routes = read_routes(file_path)
-    print(routes)
+    optimizer = RouteOptimizer(routes)
 
-    shortest_distance = get_shortest_distance_to_visit_all_cities(routes)
+    shortest_distance = optimizer.shortest_distance()
     print(f"Shortest distance to visit all cities: {shortest_distance}")
 
+    longest_distance = optimizer.longest_distance()
+    print(f"Longest distance to visit all cities: {longest_distance}")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file